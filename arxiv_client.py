@@ -0,0 +1,22 @@
+"""Shared arXiv API and HTTP clients."""
+
+from __future__ import annotations
+
+import threading
+
+import arxiv
+import httpx
+
+# One client for the whole process, so discovery and ingestion share a
+# connection pool and arXiv's per-client request delay.
+CLIENT = arxiv.Client(page_size=100, delay_seconds=3, num_retries=3)
+
+# arxiv.Client checks the time of its last request without a lock, so
+# threads calling CLIENT at once all send immediately. Hold this around
+# every CLIENT.results() call (consuming the results inside) to keep to
+# arXiv's one request per 3 seconds.
+API_LOCK = threading.Lock()
+
+# Plain HTTP client for PDF downloads and OAI-PMH harvesting; reused so
+# TLS/HTTP2 connections persist across requests
+HTTP_CLIENT = httpx.Client(http2=True, follow_redirects=True, timeout=60.0)
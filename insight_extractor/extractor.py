@@ -1,23 +1,98 @@
-"""AI-powered insight extraction using Claude Code SDK."""
+"""AI-powered insight extraction using the Anthropic SDK."""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
 
-if TYPE_CHECKING:
-    from models import PaperInsights
+import msgspec
+import orjson
+from models import PaperInsights
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+# Claude model used for extraction
+MODEL = "claude-sonnet-4-5"
+
+# Characters of paper text sent to Claude
+MAX_TEXT_LENGTH = 8000
+
+# Part of the insight cache key; bump when the prompt or response format changes
+PROMPT_VERSION = "1"
+
+# Fixed pieces of the per-paper user message
+_PROMPT_HEAD = "Paper Title: "
+_PROMPT_MID = "\n\nPaper Text:\n"
+_TRUNCATION_NOTE = "\n\n[... text truncated ...]"
+
+# JSON object inside an optional ```json fenced block (the first block, if several)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Decodes cached insights straight into PaperInsights (DecodeError is a ValueError)
+_CACHE_DECODER = msgspec.json.Decoder(PaperInsights)
+
+# PaperInsights fields expected in Claude's JSON response
+_INSIGHT_FIELDS = (
+    "problem",
+    "method",
+    "key_results",
+    "contributions",
+    "related_work",
+    "future_directions",
+    "classification",
+)
+
+# Static instructions sent as a cached system prompt. Keep this byte-for-byte
+# stable so Claude can reuse the cached prefix across papers.
+STATIC_INSTRUCTIONS = """Extract key insights from the research paper provided by the user.
+
+Please analyze the paper and extract the following information:
+
+1. PROBLEM: What problem or research question does this paper address? (2-3 sentences)
+2. METHOD: What approach or method does the paper use? (2-3 sentences)
+3. KEY RESULTS: What are the main results or findings? (2-3 sentences)
+4. CONTRIBUTIONS: What are the key contributions? (bullet points)
+5. RELATED WORK: What related work is referenced? (list 3-5 key papers/areas)
+6. FUTURE DIRECTIONS: What future research directions are mentioned? (bullet points)
+7. CLASSIFICATION: Is this foundational (introduces new concepts/methods) or incremental (improves existing work)?
+
+Format your response as JSON:
+{
+  "problem": "...",
+  "method": "...",
+  "key_results": "...",
+  "contributions": ["...", "..."],
+  "related_work": ["...", "..."],
+  "future_directions": ["...", "..."],
+  "classification": "foundational" or "incremental"
+}"""
 
 
 class InsightExtractor:
     """Extracts structured insights from paper text using Claude."""
 
-    def __init__(self):
-        """Initialize extractor."""
+    def __init__(self, cache_dir: Path | None = None):
+        """Initialize extractor.
+
+        Args:
+            cache_dir: Directory for cached insights (default: .data/paper_reader/insight_cache)
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / ".data" / "paper_reader" / "insight_cache"
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_text_length = MAX_TEXT_LENGTH
 
     def extract(self, paper_text: str, paper_title: str) -> PaperInsights:
         """Extract insights from paper text.
 
-        Uses Claude Code SDK to analyze paper and extract:
+        Uses Claude (through the Anthropic SDK) to analyze paper and extract:
         - Problem being addressed
         - Method/approach used
         - Key results
@@ -26,6 +101,9 @@ class InsightExtractor:
         - Future directions
         - Classification (foundational vs incremental)
 
+        Results are cached by paper content, so re-adding the same paper
+        does not call Claude again.
+
         Args:
             paper_text: Full text of paper
             paper_title: Title of paper
@@ -36,30 +114,75 @@ class InsightExtractor:
         Raises:
             ValueError: If extraction fails
         """
-        from claude_code import ClaudeCode
+        cache_path = self._get_cache_path(paper_title, paper_text)
+        try:
+            return _CACHE_DECODER.decode(cache_path.read_bytes())
+        except (OSError, ValueError):
+            pass  # Not cached yet (or unreadable): extract again
+
+        if anthropic is None:
+            raise ValueError(
+                "Failed to extract insights: Anthropic SDK is not installed.\n"
+                "Install the anthropic package in this environment to extract insights."
+            )
 
         # Build prompt for Claude
         prompt = self._build_extraction_prompt(paper_title, paper_text)
 
         try:
-            # Use Claude Code SDK to extract insights
-            claude = ClaudeCode()
-            response = claude.generate(
-                prompt=prompt,
+            # The Messages API takes the instructions as a cached system block
+            message = anthropic.Anthropic().messages.create(
+                model=MODEL,
+                system=[{"type": "text", "text": STATIC_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}}],
+                messages=[{"role": "user", "content": prompt}],
                 max_tokens=2000,
                 temperature=0.2,  # Lower temperature for more focused extraction
             )
+            response = "".join(block.text for block in message.content if block.type == "text")
 
             # Parse response into PaperInsights
             insights = self._parse_response(response)
 
-            return insights
-
         except Exception as e:
             raise ValueError(f"Failed to extract insights: {e}")
 
+        self._write_cache(cache_path, insights)
+        return insights
+
+    def _write_cache(self, cache_path: Path, insights: PaperInsights) -> None:
+        """Cache extracted insights, best effort.
+
+        A failed write (read-only or full disk) is ignored rather than
+        losing insights Claude already returned. Written through a uniquely
+        named temporary file, so concurrent extractions of the same paper
+        don't collide.
+        """
+        try:
+            fd, tmp_name = tempfile.mkstemp(suffix=".json.tmp", dir=self.cache_dir)
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(insights))
+            os.replace(tmp_name, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+    def _get_cache_path(self, title: str, text: str) -> Path:
+        """Get cache file for a paper, keyed on prompt version, title, and prompt text."""
+        key = "\0".join((PROMPT_VERSION, title, text[: self.max_text_length]))
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
     def _build_extraction_prompt(self, title: str, text: str) -> str:
-        """Build prompt for Claude to extract insights.
+        """Build the per-paper user message for Claude.
+
+        The extraction instructions live in STATIC_INSTRUCTIONS (sent as a
+        cached system prompt), so only the paper itself is included here.
 
         Args:
             title: Paper title
@@ -69,40 +192,11 @@ class InsightExtractor:
             Formatted prompt
         """
         # Truncate text if too long (keep first ~8000 chars for context)
-        max_text_length = 8000
+        max_text_length = self.max_text_length
         truncated_text = text[:max_text_length]
-        if len(text) > max_text_length:
-            truncated_text += "\n\n[... text truncated ...]"
+        tail = _TRUNCATION_NOTE if len(text) > max_text_length else ""
 
-        prompt = f"""Extract key insights from this research paper.
-
-Paper Title: {title}
-
-Paper Text:
-{truncated_text}
-
-Please analyze this paper and extract the following information:
-
-1. PROBLEM: What problem or research question does this paper address? (2-3 sentences)
-2. METHOD: What approach or method does the paper use? (2-3 sentences)
-3. KEY RESULTS: What are the main results or findings? (2-3 sentences)
-4. CONTRIBUTIONS: What are the key contributions? (bullet points)
-5. RELATED WORK: What related work is referenced? (list 3-5 key papers/areas)
-6. FUTURE DIRECTIONS: What future research directions are mentioned? (bullet points)
-7. CLASSIFICATION: Is this foundational (introduces new concepts/methods) or incremental (improves existing work)?
-
-Format your response as JSON:
-{{
-  "problem": "...",
-  "method": "...",
-  "key_results": "...",
-  "contributions": ["...", "..."],
-  "related_work": ["...", "..."],
-  "future_directions": ["...", "..."],
-  "classification": "foundational" or "incremental"
-}}"""
-
-        return prompt
+        return "".join((_PROMPT_HEAD, title, _PROMPT_MID, truncated_text, tail))
 
     def _parse_response(self, response: str) -> PaperInsights:
         """Parse Claude response into PaperInsights.
@@ -116,38 +210,14 @@ Format your response as JSON:
         Raises:
             ValueError: If parsing fails
         """
-        import json
-
-        from models import PaperInsights
-
         try:
             # Extract JSON from response (may have markdown wrapper)
-            if "```json" in response:
-                json_start = response.find("```json") + 7
-                json_end = response.find("```", json_start)
-                json_str = response[json_start:json_end].strip()
-            elif "```" in response:
-                json_start = response.find("```") + 3
-                json_end = response.find("```", json_start)
-                json_str = response[json_start:json_end].strip()
-            else:
-                json_str = response.strip()
-
-            # Parse JSON
-            data = json.loads(json_str)
-
-            # Create PaperInsights
-            insights = PaperInsights(
-                problem=data["problem"],
-                method=data["method"],
-                key_results=data["key_results"],
-                contributions=data["contributions"],
-                related_work=data["related_work"],
-                future_directions=data["future_directions"],
-                classification=data["classification"],
-            )
+            match = _FENCE_RE.search(response)
+            json_str = match.group(1) if match else response.strip()
 
-            return insights
+            # Parse JSON and create PaperInsights
+            data = orjson.loads(json_str)
+            return PaperInsights(**{key: data[key] for key in _INSIGHT_FIELDS})
 
         except Exception as e:
             raise ValueError(f"Failed to parse response: {e}")
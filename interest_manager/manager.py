@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
 
+import msgspec
+import orjson
 from models import ResearchInterests
 
+# Decodes interests.json straight into a validated ResearchInterests
+_DECODER = msgspec.json.Decoder(ResearchInterests)
+
 
 class InterestManager:
     """Manages user's research interests.
@@ -25,33 +33,99 @@ class InterestManager:
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.interests_file = self.data_dir / "interests.json"
+        self._pending: ResearchInterests | None = None
+        self._dirty = False
+        self._cache: tuple[tuple[int, int, int, int], ResearchInterests] | None = None
 
     def load(self) -> ResearchInterests | None:
         """Load interests from file.
 
+        The parsed file is cached until its inode, modification or change
+        time, or size changes (saves rename a new file into place, so even a
+        same-size save within one mtime tick is seen); each call returns a fresh copy, so changing it doesn't
+        change the cache. Inside batch(), returns the pending in-memory
+        interests.
+
         Returns:
             ResearchInterests if file exists, None otherwise
+
+        Raises:
+            ValueError: If the interests file exists but cannot be parsed
         """
-        if not self.interests_file.exists():
-            return None
+        if self._pending is not None:
+            return self._pending
 
         try:
-            with open(self.interests_file, encoding="utf-8") as f:
-                data = json.load(f)
-            return ResearchInterests(**data)
-        except Exception:
+            stat = self.interests_file.stat()
+        except FileNotFoundError:
             return None
 
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+        if self._cache and self._cache[0] == version:
+            return _copy(self._cache[1])
+
+        try:
+            interests = _DECODER.decode(self.interests_file.read_bytes())
+        except msgspec.DecodeError as e:
+            raise ValueError(
+                f"Could not read interests file: {self.interests_file}\n"
+                f"{e}\n"
+                f"Fix or delete the file and run 'paper-reader init' again."
+            )
+
+        self._cache = (version, interests)
+        return _copy(interests)
+
     def save(self, interests: ResearchInterests) -> None:
         """Save interests to file.
 
+        Written to a temporary file, synced, and renamed over the old file,
+        so a crash leaves either the old or the new interests, never a mix.
+
         Args:
             interests: Research interests to save
         """
-        from dataclasses import asdict
+        self._cache = None
+        tmp_file = self.interests_file.with_suffix(".json.tmp")
 
-        with open(self.interests_file, "w", encoding="utf-8") as f:
-            json.dump(asdict(interests), f, indent=2, ensure_ascii=False)
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, orjson.dumps(interests, option=orjson.OPT_INDENT_2))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, self.interests_file)
+
+        # Make the rename itself durable (POSIX only)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(self.data_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Apply several add/remove calls with a single load and save.
+
+        Example:
+            with manager.batch():
+                manager.add_topic("MIMO")
+                manager.add_topic("beamforming")
+        """
+        if self._pending is not None:
+            # Already batching; the outer batch saves
+            yield
+            return
+
+        self._pending = self.load() or ResearchInterests(areas=[], topics=[], arxiv_categories=[])
+        self._dirty = False
+        try:
+            yield
+            if self._dirty:
+                self.save(self._pending)
+        finally:
+            self._pending = None
 
     def add_area(self, area: str) -> None:
         """Add research area.
@@ -62,7 +136,7 @@ class InterestManager:
         interests = self.load() or ResearchInterests(areas=[], topics=[], arxiv_categories=[])
         if area not in interests.areas:
             interests.areas.append(area)
-            self.save(interests)
+            self._commit(interests)
 
     def add_topic(self, topic: str) -> None:
         """Add specific topic.
@@ -73,7 +147,7 @@ class InterestManager:
         interests = self.load() or ResearchInterests(areas=[], topics=[], arxiv_categories=[])
         if topic not in interests.topics:
             interests.topics.append(topic)
-            self.save(interests)
+            self._commit(interests)
 
     def add_category(self, category: str) -> None:
         """Add arXiv category.
@@ -84,7 +158,7 @@ class InterestManager:
         interests = self.load() or ResearchInterests(areas=[], topics=[], arxiv_categories=[])
         if category not in interests.arxiv_categories:
             interests.arxiv_categories.append(category)
-            self.save(interests)
+            self._commit(interests)
 
     def remove_area(self, area: str) -> None:
         """Remove research area.
@@ -95,7 +169,7 @@ class InterestManager:
         interests = self.load()
         if interests and area in interests.areas:
             interests.areas.remove(area)
-            self.save(interests)
+            self._commit(interests)
 
     def remove_topic(self, topic: str) -> None:
         """Remove topic.
@@ -106,7 +180,7 @@ class InterestManager:
         interests = self.load()
         if interests and topic in interests.topics:
             interests.topics.remove(topic)
-            self.save(interests)
+            self._commit(interests)
 
     def remove_category(self, category: str) -> None:
         """Remove arXiv category.
@@ -117,4 +191,21 @@ class InterestManager:
         interests = self.load()
         if interests and category in interests.arxiv_categories:
             interests.arxiv_categories.remove(category)
+            self._commit(interests)
+
+    def _commit(self, interests: ResearchInterests) -> None:
+        """Save modified interests now, or at the end of the current batch."""
+        if self._pending is not None:
+            self._dirty = True
+        else:
             self.save(interests)
+
+
+def _copy(interests: ResearchInterests) -> ResearchInterests:
+    """Copy interests, including their lists."""
+    return replace(
+        interests,
+        areas=list(interests.areas),
+        topics=list(interests.topics),
+        arxiv_categories=list(interests.arxiv_categories),
+    )
@@ -1,5 +1,6 @@
 """Paper Reader CLI."""
 
+import asyncio
 from datetime import datetime
 from typing import Literal
 from typing import cast
@@ -8,10 +9,16 @@ import click
 from insight_extractor import InsightExtractor
 from interest_manager import InterestManager
 from models import Paper
+from models import PaperCandidate
+from models import PaperInsights
 from models import ResearchInterests
 from paper_discovery import PaperDiscoverer
 from paper_ingestor import PaperIngestor
 from paper_store import PaperStore
+from paper_store import to_pretty_json
+
+# Concurrent paper downloads allowed by add-many (arXiv API calls are serialized)
+MAX_CONCURRENT_DOWNLOADS = 4
 
 # Initialize managers
 interest_manager = InterestManager()
@@ -115,7 +122,7 @@ def add(arxiv_id: str):
 
         # Download and extract text
         click.echo("Downloading PDF...")
-        pdf_path, paper_text = ingestor.ingest_from_arxiv(candidate)
+        pdf_path, paper_text = ingestor.ingest_from_arxiv(candidate, max_chars=extractor.max_text_length)
         click.echo(f"✓ PDF saved: {pdf_path}")
 
         # Extract insights
@@ -124,19 +131,7 @@ def add(arxiv_id: str):
         click.echo("✓ Insights extracted")
 
         # Create paper
-        interests = interest_manager.load()
-        paper = Paper(
-            id=candidate.id,
-            title=candidate.title,
-            authors=candidate.authors,
-            url=candidate.url,
-            pdf_path=str(pdf_path),
-            added_date=datetime.now().isoformat(),
-            interests=interests.topics if interests else [],
-            insights=insights,
-            status="to-read",
-            notes="",
-        )
+        paper = _new_paper(candidate, pdf_path, insights, interest_manager.load())
 
         # Save to store
         paper_store.add(paper)
@@ -151,29 +146,98 @@ def add(arxiv_id: str):
         raise
 
 
+@cli.command("add-many")
+@click.argument("arxiv_ids", nargs=-1, required=True)
+def add_many(arxiv_ids: tuple[str, ...]):
+    """Add several papers by arXiv ID concurrently."""
+    click.echo(f"📄 Adding {len(arxiv_ids)} papers...\n")
+
+    results = asyncio.run(_add_many(arxiv_ids))
+
+    added = 0
+    for arxiv_id, result in zip(arxiv_ids, results, strict=True):
+        if isinstance(result, BaseException):
+            click.echo(f"❌ {arxiv_id}: {result}")
+        else:
+            added += 1
+            click.echo(f"✓ {arxiv_id}: {result.title}")
+
+    click.echo(f"\n✅ Added {added} of {len(arxiv_ids)} papers")
+
+
+async def _add_many(arxiv_ids: tuple[str, ...]) -> list[Paper | BaseException]:
+    """Fetch, ingest, and extract insights for several papers at once."""
+    interests = interest_manager.load()
+    arxiv_slots = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+    return await asyncio.gather(
+        *(_add_one(arxiv_id, interests, arxiv_slots) for arxiv_id in arxiv_ids),
+        return_exceptions=True,
+    )
+
+
+async def _add_one(arxiv_id: str, interests: ResearchInterests | None, arxiv_slots: asyncio.Semaphore) -> Paper:
+    """Add a single paper, running blocking steps in worker threads."""
+    # PDF downloads share the concurrency limit; arXiv API calls inside
+    # are further serialized by arxiv_client.API_LOCK
+    async with arxiv_slots:
+        candidate = await asyncio.to_thread(discoverer.get_by_id, arxiv_id)
+        if not candidate:
+            raise ValueError(f"Paper {arxiv_id} not found on arXiv")
+
+        pdf_path, paper_text = await asyncio.to_thread(
+            ingestor.ingest_from_arxiv, candidate, extractor.max_text_length
+        )
+
+    insights = await asyncio.to_thread(extractor.extract, paper_text, candidate.title)
+
+    # Store writes stay on the event loop thread
+    paper = _new_paper(candidate, pdf_path, insights, interests)
+    paper_store.add(paper)
+    return paper
+
+
+def _new_paper(
+    candidate: PaperCandidate, pdf_path: str, insights: PaperInsights, interests: ResearchInterests | None
+) -> Paper:
+    """Create a to-read collection paper from an arXiv candidate."""
+    return Paper(
+        id=candidate.id,
+        title=candidate.title,
+        authors=candidate.authors,
+        url=candidate.url,
+        pdf_path=str(pdf_path),
+        added_date=datetime.now().isoformat(),
+        interests=interests.topics if interests else [],
+        insights=insights,
+        status="to-read",
+        notes="",
+    )
+
+
 @cli.command()
 def list():
     """List all papers in collection."""
     click.echo("📚 Your Paper Collection\n")
 
-    papers = paper_store.list_all()
+    summaries = paper_store.list_summaries()
 
-    if not papers:
+    if not summaries:
         click.echo("No papers in collection yet.")
         click.echo("💡 Discover papers with: paper-reader discover")
         return
 
     # Group by status
     by_status = {"to-read": [], "reading": [], "read": []}
-    for paper in papers:
-        by_status[paper.status].append(paper)
+    for summary in summaries:
+        by_status[summary.status].append(summary)
 
     for status, papers_list in by_status.items():
         if papers_list:
             click.echo(f"{status.upper()} ({len(papers_list)}):")
             for paper in papers_list:
                 click.echo(f"  • {paper.title}")
-                click.echo(f"    {paper.id} - {paper.insights.classification if paper.insights else 'N/A'}")
+                click.echo(f"    {paper.id} - {paper.classification or 'N/A'}")
             click.echo()
 
 
@@ -201,7 +265,8 @@ def search(query: str):
 
 @cli.command()
 @click.argument("paper_id")
-def show(paper_id: str):
+@click.option("--pretty", is_flag=True, help="Print the stored paper as indented JSON")
+def show(paper_id: str, pretty: bool):
     """Show detailed information about a paper."""
     paper = paper_store.get(paper_id)
 
@@ -209,6 +274,10 @@ def show(paper_id: str):
         click.echo(f"❌ Paper {paper_id} not found")
         return
 
+    if pretty:
+        click.echo(to_pretty_json(paper))
+        return
+
     click.echo(f"\n📄 {paper.title}\n")
     click.echo(f"ID: {paper.id}")
     click.echo(f"Authors: {', '.join(paper.authors)}")
@@ -5,9 +5,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Literal
+from typing import NamedTuple
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchInterests:
     """User's research interests for paper discovery.
 
@@ -22,7 +23,7 @@ class ResearchInterests:
     arxiv_categories: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PaperCandidate:
     """Paper discovered from arXiv but not yet added to collection.
 
@@ -45,7 +46,7 @@ class PaperCandidate:
     arxiv_categories: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class PaperInsights:
     """Extracted insights from paper analysis.
 
@@ -68,7 +69,7 @@ class PaperInsights:
     classification: Literal["foundational", "incremental"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Paper:
     """Paper in user's collection with extracted insights.
 
@@ -80,7 +81,7 @@ class Paper:
         pdf_path: Path to downloaded/local PDF (if available)
         added_date: When paper was added to collection (ISO format)
         interests: Research areas/topics this paper relates to
-        insights: Extracted structured insights
+        insights: Extracted structured insights (None if not extracted)
         status: Reading status
         notes: User's personal notes
     """
@@ -92,6 +93,22 @@ class Paper:
     pdf_path: str | None
     added_date: str
     interests: list[str]
-    insights: PaperInsights
+    insights: PaperInsights | None
     status: Literal["to-read", "reading", "read"]
     notes: str = ""
+
+
+class PaperSummary(NamedTuple):
+    """Lightweight view of a collection paper for listings.
+
+    Attributes:
+        id: Unique identifier (e.g., "arxiv:2301.12345")
+        title: Paper title
+        status: Reading status
+        classification: Insight classification, or None if no insights
+    """
+
+    id: str
+    title: str
+    status: Literal["to-read", "reading", "read"]
+    classification: Literal["foundational", "incremental"] | None
@@ -2,24 +2,51 @@
 
 from __future__ import annotations
 
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import replace
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
+from io import BytesIO
 from typing import TYPE_CHECKING
 
 import arxiv
+import httpx
+from arxiv_client import API_LOCK
+from arxiv_client import CLIENT
+from arxiv_client import HTTP_CLIENT
 
 if TYPE_CHECKING:
     from models import PaperCandidate
     from models import ResearchInterests
 
+# Topics per arXiv query; larger topic lists are split into queries run one at a time
+TOPIC_CHUNK_SIZE = 8
+
+# Above one search API page (with its inter-page delay), harvest categories via OAI-PMH
+OAI_MIN_RESULTS = 100
+OAI_URL = "https://export.arxiv.org/oai2"
+
+# Seconds to wait on an OAI-PMH 503: Retry-After when it's a number of
+# seconds (capped), the default otherwise (e.g. an HTTP date)
+OAI_RETRY_DEFAULT = 10
+OAI_RETRY_MAX = 60
+
+_OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+# arXiv archives with their own OAI set; all others live under "physics:<archive>"
+_OAI_TOP_SETS = frozenset({"cs", "econ", "eess", "math", "q-bio", "q-fin", "stat"})
+
 
 class PaperDiscoverer:
     """Discovers papers from arXiv based on research interests."""
 
     def __init__(self) -> None:
         """Initialize discoverer."""
-        self.client = arxiv.Client()
+        self.client = CLIENT
+        self.http = HTTP_CLIENT
 
     def discover(self, interests: ResearchInterests, days: int = 7, max_results: int = 20) -> list[PaperCandidate]:
         """Discover papers from arXiv.
@@ -29,19 +56,51 @@ class PaperDiscoverer:
             days: Number of days to look back (default: 7)
             max_results: Maximum results per query (default: 20)
 
+        Large category-based requests are harvested in bulk via OAI-PMH
+        instead of paging through the search API.
+
         Returns:
             List of discovered paper candidates
         """
-        from models import PaperCandidate
-
-        # Build search query
-        query = self._build_query(interests)
-
-        # Calculate date range
+        # Calculate date range (applied server-side via submittedDate)
         end_date = datetime.now(UTC)
         start_date = end_date - timedelta(days=days)
+        date_range = (start_date, end_date)
+
+        if interests.arxiv_categories and max_results > OAI_MIN_RESULTS:
+            return self._discover_oai(interests, start_date, max_results)
+
+        topics = interests.topics
+        if len(topics) <= TOPIC_CHUNK_SIZE:
+            return self._search(self._build_query(interests, date_range), max_results)
+
+        # Split large topic lists into several smaller queries
+        queries = [
+            self._build_query(replace(interests, topics=topics[i : i + TOPIC_CHUNK_SIZE]), date_range)
+            for i in range(0, len(topics), TOPIC_CHUNK_SIZE)
+        ]
+        # One at a time: the shared client allows one arXiv request per 3 seconds
+        batches = [self._search(query, max_results) for query in queries]
+
+        # Merge, dropping papers matched by more than one chunk
+        seen: dict[str, PaperCandidate] = {}
+        for batch in batches:
+            for candidate in batch:
+                seen.setdefault(candidate.id, candidate)
+
+        candidates = sorted(seen.values(), key=lambda c: c.published_date, reverse=True)
+        return candidates[:max_results]
+
+    def _search(self, query: str, max_results: int) -> list[PaperCandidate]:
+        """Run a single arXiv query.
 
-        # Search arXiv
+        Args:
+            query: arXiv search query string
+            max_results: Maximum results to return
+
+        Returns:
+            List of paper candidates, newest first
+        """
         search = arxiv.Search(
             query=query,
             max_results=max_results,
@@ -49,60 +108,156 @@ class PaperDiscoverer:
             sort_order=arxiv.SortOrder.Descending,
         )
 
-        # Convert results to PaperCandidate
+        with API_LOCK:
+            results = list(self.client.results(search))
+
+        return [self._to_candidate(result) for result in results]
+
+    def _to_candidate(self, result: arxiv.Result) -> PaperCandidate:
+        """Convert arXiv result to PaperCandidate."""
+        from models import PaperCandidate
+
+        return PaperCandidate(
+            id=f"arxiv:{result.entry_id.split('/')[-1]}",
+            title=result.title,
+            authors=[author.name for author in result.authors],
+            abstract=result.summary,
+            url=result.entry_id,
+            published_date=result.published.isoformat(),
+            arxiv_categories=result.categories,
+        )
+
+    def _discover_oai(
+        self, interests: ResearchInterests, start_date: datetime, max_results: int
+    ) -> list[PaperCandidate]:
+        """Discover papers by harvesting arXiv's OAI-PMH ListRecords endpoint.
+
+        Each request returns up to ~1000 records, so large windows need far
+        fewer round-trips than the search API. Categories, submission date,
+        and topics (or areas) are filtered locally.
+
+        Args:
+            interests: Research interests with arXiv categories
+            start_date: Earliest submission date to include
+            max_results: Maximum results to return
+
+        Returns:
+            List of paper candidates, newest first
+        """
+        categories = set(interests.arxiv_categories)
+        terms = [term.casefold() for term in interests.topics or interests.areas]
+        oai_sets = sorted({self._oai_set(category) for category in categories})
+        since = start_date.strftime("%Y-%m-%d")
+
         candidates = []
-        for result in self.client.results(search):
-            # Filter by date
-            if result.published < start_date:
-                continue
-
-            candidate = PaperCandidate(
-                id=f"arxiv:{result.entry_id.split('/')[-1]}",
-                title=result.title,
-                authors=[author.name for author in result.authors],
-                abstract=result.summary,
-                url=result.entry_id,
-                published_date=result.published.isoformat(),
-                arxiv_categories=result.categories,
-            )
-            candidates.append(candidate)
-
-        return candidates
-
-    def _build_query(self, interests: ResearchInterests) -> str:
+        for oai_set in oai_sets:
+            params: dict[str, str] | None = {
+                "verb": "ListRecords",
+                "metadataPrefix": "arXiv",
+                "set": oai_set,
+                "from": since,
+            }
+            while params:
+                content = self._oai_request(params)
+                token = None
+                for _, elem in ET.iterparse(BytesIO(content)):
+                    if elem.tag == f"{_ARXIV_NS}arXiv":
+                        candidate = self._oai_to_candidate(elem)
+                        text = f"{candidate.title} {candidate.abstract}".casefold()
+                        if (
+                            categories.intersection(candidate.arxiv_categories)
+                            and candidate.published_date >= since
+                            and (not terms or any(term in text for term in terms))
+                        ):
+                            candidates.append(candidate)
+                        elem.clear()
+                    elif elem.tag == f"{_OAI_NS}resumptionToken":
+                        token = elem.text
+                params = {"verb": "ListRecords", "resumptionToken": token} if token else None
+
+        # Papers cross-listed in several sets appear once per set
+        unique = {candidate.id: candidate for candidate in candidates}
+        newest = sorted(unique.values(), key=lambda c: c.published_date, reverse=True)
+        return newest[:max_results]
+
+    def _oai_request(self, params: dict[str, str]) -> bytes:
+        """Fetch one OAI-PMH page, honouring arXiv's 503 Retry-After flow control."""
+        try:
+            response = self.http.get(OAI_URL, params=params)
+            for _ in range(4):
+                if response.status_code != 503:
+                    break
+                time.sleep(_retry_after(response.headers.get("Retry-After")))
+                response = self.http.get(OAI_URL, params=params)
+
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise ValueError(f"arXiv OAI-PMH request failed: {e}")
+
+        return response.content
+
+    def _oai_set(self, category: str) -> str:
+        """Map an arXiv category (e.g. "cs.LG", "hep-th") to its OAI set spec."""
+        archive = category.split(".")[0]
+        return archive if archive in _OAI_TOP_SETS else f"physics:{archive}"
+
+    def _oai_to_candidate(self, record: ET.Element) -> PaperCandidate:
+        """Convert an OAI-PMH arXiv metadata record to PaperCandidate."""
+        from models import PaperCandidate
+
+        def text(tag: str) -> str:
+            return " ".join((record.findtext(f"{_ARXIV_NS}{tag}") or "").split())
+
+        authors = []
+        for author in record.iter(f"{_ARXIV_NS}author"):
+            parts = (author.findtext(f"{_ARXIV_NS}forenames"), author.findtext(f"{_ARXIV_NS}keyname"))
+            authors.append(" ".join(part for part in parts if part))
+
+        arxiv_id = text("id")
+        return PaperCandidate(
+            id=f"arxiv:{arxiv_id}",
+            title=text("title"),
+            authors=authors,
+            abstract=text("abstract"),
+            url=f"http://arxiv.org/abs/{arxiv_id}",
+            published_date=text("created"),
+            arxiv_categories=text("categories").split(),
+        )
+
+    def _build_query(
+        self, interests: ResearchInterests, date_range: tuple[datetime, datetime] | None = None
+    ) -> str:
         """Build arXiv search query from interests.
 
         Args:
             interests: Research interests
+            date_range: Optional (start, end) submission window, filtered server-side
 
         Returns:
             arXiv search query string
         """
+        terms = interests.topics or interests.areas
+        if not interests.arxiv_categories and not terms and not date_range:
+            return "all:*"  # Return all if no criteria
+
         query_parts = []
 
         # Add categories if specified
         if interests.arxiv_categories:
-            cat_queries = [f"cat:{cat}" for cat in interests.arxiv_categories]
-            query_parts.append("(" + " OR ".join(cat_queries) + ")")
-
-        # Add topics (search in title and abstract)
-        if interests.topics:
-            topic_queries = []
-            for topic in interests.topics:
-                topic_queries.append(f'(ti:"{topic}" OR abs:"{topic}")')
-            query_parts.append("(" + " OR ".join(topic_queries) + ")")
-
-        # Add areas if no topics specified
-        elif interests.areas:
-            area_queries = []
-            for area in interests.areas:
-                area_queries.append(f'(ti:"{area}" OR abs:"{area}")')
-            query_parts.append("(" + " OR ".join(area_queries) + ")")
+            cats = " OR ".join(f"cat:{cat}" for cat in interests.arxiv_categories)
+            query_parts.append(f"({cats})")
 
-        # Combine with AND
-        if not query_parts:
-            return "all:*"  # Return all if no criteria
+        # Add topics, or areas if no topics specified (search in title and abstract)
+        if terms:
+            topics = " OR ".join(f'(ti:"{term}" OR abs:"{term}")' for term in terms)
+            query_parts.append(f"({topics})")
+
+        # Restrict to submission window
+        if date_range:
+            start, end = date_range
+            query_parts.append(f"submittedDate:[{start:%Y%m%d%H%M} TO {end:%Y%m%d%H%M}]")
 
+        # Combine with AND
         return " AND ".join(query_parts)
 
     def get_by_id(self, arxiv_id: str) -> PaperCandidate | None:
@@ -114,25 +269,22 @@ class PaperDiscoverer:
         Returns:
             PaperCandidate if found, None otherwise
         """
-        from models import PaperCandidate
-
         # Clean ID
         clean_id = arxiv_id.replace("arxiv:", "")
 
         # Search by ID
         search = arxiv.Search(id_list=[clean_id])
 
-        try:
-            result = next(self.client.results(search))
-
-            return PaperCandidate(
-                id=f"arxiv:{result.entry_id.split('/')[-1]}",
-                title=result.title,
-                authors=[author.name for author in result.authors],
-                abstract=result.summary,
-                url=result.entry_id,
-                published_date=result.published.isoformat(),
-                arxiv_categories=result.categories,
-            )
-        except StopIteration:
-            return None
+        with API_LOCK:
+            result = next(self.client.results(search), None)
+
+        return self._to_candidate(result) if result else None
+
+
+def _retry_after(value: str | None) -> int:
+    """Seconds to wait for a Retry-After header value."""
+    try:
+        seconds = int(value or "")
+    except ValueError:
+        return OAI_RETRY_DEFAULT
+    return min(max(seconds, 0), OAI_RETRY_MAX)
@@ -2,16 +2,39 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import arxiv
+import httpx
+from arxiv_client import API_LOCK
+from arxiv_client import CLIENT
+from arxiv_client import HTTP_CLIENT
 from pypdf import PdfReader
 
+try:
+    import fitz  # PyMuPDF: optional, much faster C-based text extraction
+except ImportError:
+    fitz = None
+
 if TYPE_CHECKING:
     from models import PaperCandidate
 
 
+def _read_pages(texts: Iterable[str | None], max_chars: int | None) -> list[str | None]:
+    """Collect page texts in order, stopping after the page that reaches max_chars."""
+    page_texts = []
+    running = 0
+    for text in texts:
+        page_texts.append(text)
+        running += len(text or "")
+        if max_chars and running >= max_chars:
+            break
+
+    return page_texts
+
+
 class PaperIngestor:
     """Ingests papers and extracts text content."""
 
@@ -25,15 +48,19 @@ class PaperIngestor:
             pdf_dir = Path.home() / ".data" / "papers" / "pdfs"
         self.pdf_dir = pdf_dir
         self.pdf_dir.mkdir(parents=True, exist_ok=True)
-        self.client = arxiv.Client()
+        self.client = CLIENT
+        self.http = HTTP_CLIENT
 
-    def ingest_from_arxiv(self: PaperIngestor, candidate: PaperCandidate) -> tuple[str, str]:
+    def ingest_from_arxiv(
+        self: PaperIngestor, candidate: PaperCandidate, max_chars: int | None = None
+    ) -> tuple[str, str]:
         """Ingest paper from arXiv.
 
         Downloads PDF and extracts text.
 
         Args:
             candidate: Paper candidate with arXiv ID
+            max_chars: Stop extracting once this many characters are read (default: all)
 
         Returns:
             Tuple of (pdf_path, extracted_text)
@@ -44,19 +71,27 @@ class PaperIngestor:
         # Get clean arXiv ID
         arxiv_id = candidate.id.replace("arxiv:", "")
 
-        # Download PDF
-        pdf_path = self._download_pdf(arxiv_id)
+        # Download PDF straight from the candidate's URL, re-querying arXiv only if that fails
+        if "/abs/" in candidate.url:
+            pdf_url = candidate.url.replace("/abs/", "/pdf/")
+            try:
+                pdf_path = self._download_pdf_direct(arxiv_id, pdf_url)
+            except ValueError:
+                pdf_path = self._download_pdf(arxiv_id)
+        else:
+            pdf_path = self._download_pdf(arxiv_id)
 
         # Extract text
-        text = self._extract_text(pdf_path)
+        text = self._extract_text(pdf_path, max_chars=max_chars)
 
         return str(pdf_path), text
 
-    def ingest_from_local(self: PaperIngestor, pdf_path: Path) -> str:
+    def ingest_from_local(self: PaperIngestor, pdf_path: Path, max_chars: int | None = None) -> str:
         """Ingest paper from local PDF file.
 
         Args:
             pdf_path: Path to local PDF
+            max_chars: Stop extracting once this many characters are read (default: all)
 
         Returns:
             Extracted text
@@ -68,7 +103,7 @@ class PaperIngestor:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-        return self._extract_text(pdf_path)
+        return self._extract_text(pdf_path, max_chars=max_chars)
 
     def _download_pdf(self: PaperIngestor, arxiv_id: str) -> Path:
         """Download PDF from arXiv.
@@ -85,9 +120,9 @@ class PaperIngestor:
         # Search for paper
         search = arxiv.Search(id_list=[arxiv_id])
 
-        try:
-            result = next(self.client.results(search))
-        except StopIteration:
+        with API_LOCK:
+            result = next(self.client.results(search), None)
+        if result is None:
             raise ValueError(f"Paper {arxiv_id} not found on arXiv")
 
         # Download PDF
@@ -96,11 +131,38 @@ class PaperIngestor:
 
         return pdf_path
 
-    def _extract_text(self: PaperIngestor, pdf_path: Path) -> str:
+    def _download_pdf_direct(self: PaperIngestor, arxiv_id: str, pdf_url: str) -> Path:
+        """Download PDF from a known URL without querying the arXiv API.
+
+        Args:
+            arxiv_id: arXiv ID (without prefix)
+            pdf_url: Direct URL to the PDF
+
+        Returns:
+            Path to downloaded PDF
+
+        Raises:
+            ValueError: If download fails
+        """
+        pdf_path = self.pdf_dir / f"{arxiv_id}.pdf"
+
+        try:
+            with self.http.stream("GET", pdf_url) as response:
+                response.raise_for_status()
+                with open(pdf_path, "wb") as f:
+                    for chunk in response.iter_bytes(1 << 20):
+                        f.write(chunk)
+        except httpx.HTTPError as e:
+            raise ValueError(f"Failed to download {pdf_url}: {e}")
+
+        return pdf_path
+
+    def _extract_text(self: PaperIngestor, pdf_path: Path, max_chars: int | None = None) -> str:
         """Extract text from PDF.
 
         Args:
             pdf_path: Path to PDF file
+            max_chars: Stop after the page that reaches this many characters (default: all)
 
         Returns:
             Extracted text
@@ -109,15 +171,14 @@ class PaperIngestor:
             ValueError: If extraction fails
         """
         try:
-            reader = PdfReader(pdf_path)
-
-            # Extract text from all pages
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-
+            if fitz is not None:
+                with fitz.open(pdf_path) as doc:
+                    page_texts = _read_pages((page.get_text("text") for page in doc), max_chars)
+            else:
+                reader = PdfReader(pdf_path)
+                page_texts = _read_pages((page.extract_text() for page in reader.pages), max_chars)
+
+            text_parts = [text for text in page_texts if text]
             full_text = "\n\n".join(text_parts)
 
             if not full_text.strip():
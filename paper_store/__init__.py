@@ -1,5 +1,11 @@
 """Paper storage management."""
 
+from paper_store.storage import DiskStorage
+from paper_store.storage import LogStorage
+from paper_store.storage import MemoryStorage
+from paper_store.storage import Storage
 from paper_store.store import PaperStore
+from paper_store.store import Savepoint
+from paper_store.store import to_pretty_json
 
-__all__ = ["PaperStore"]
+__all__ = ["DiskStorage", "LogStorage", "MemoryStorage", "PaperStore", "Savepoint", "Storage", "to_pretty_json"]
@@ -0,0 +1,543 @@
+"""Backends holding the serialized papers of a PaperStore."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+
+import msgspec
+
+from models import Paper
+
+# Threads reading paper files in load_keys() (file reads are I/O-bound)
+_LOAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Characters in paper IDs that can't appear in file names
+_ID_TRANS = str.maketrans({":": "_", "/": "_"})
+
+# Paper files at least this large are memory-mapped rather than read into a copy
+_MMAP_MIN_SIZE = 4096
+
+PAPER_DECODER = msgspec.json.Decoder(Paper)
+
+
+class Storage(Protocol):
+    """Where a PaperStore keeps each paper's JSON, keyed by paper ID."""
+
+    def read(self, paper_id: str) -> bytes | None:
+        """Get a paper's JSON, or None if not stored."""
+        ...
+
+    def load(self, paper_id: str) -> Paper | None:
+        """Get a parsed paper, or None if not stored or unreadable."""
+        ...
+
+    def load_keys(self, keys: list[str]) -> Iterator[tuple[str, Paper]]:
+        """Parse the papers stored under the given keys, skipping unreadable ones.
+
+        Yields:
+            (key, paper) pairs
+        """
+        ...
+
+    def stamps(self) -> dict[str, str]:
+        """Get the stamp of every stored paper, by storage key.
+
+        A storage key names where a paper is stored (its file name, say); a
+        stamp changes whenever the stored paper does, including by hand.
+        """
+        ...
+
+    def stamp(self, paper_id: str) -> tuple[str, str]:
+        """Get a stored paper's storage key and stamp.
+
+        Raises:
+            FileNotFoundError: If the paper is not stored
+        """
+        ...
+
+    def exists(self, paper_id: str) -> bool:
+        """Check whether a paper is stored."""
+        ...
+
+    def write(self, paper_id: str, data: bytes, exclusive: bool = False) -> None:
+        """Store a paper's JSON.
+
+        Raises:
+            FileExistsError: If exclusive and the paper is already stored
+        """
+        ...
+
+    def delete(self, paper_id: str) -> None:
+        """Remove a paper's JSON.
+
+        Raises:
+            FileNotFoundError: If the paper is not stored
+        """
+        ...
+
+    def close(self) -> None:
+        """Release open files; the storage can't be used afterwards."""
+        ...
+
+
+class DiskStorage:
+    """Papers as JSON files in <data_dir>/<paper_id>.json."""
+
+    def __init__(self: DiskStorage, data_dir: Path) -> None:
+        """Initialize storage, creating data_dir if needed.
+
+        Args:
+            data_dir: Directory holding the paper files
+        """
+        self.data_dir = data_dir
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+    def read(self: DiskStorage, paper_id: str) -> bytes | None:
+        """Get a paper's JSON, or None if not stored."""
+        try:
+            return self._get_paper_path(paper_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def load(self: DiskStorage, paper_id: str) -> Paper | None:
+        """Get a parsed paper, or None if not stored or unreadable.
+
+        Parsed papers are cached until their file changes; each call
+        returns a copy, so modifying it doesn't change the cache.
+        """
+        return self._load_paper(self._get_paper_path(paper_id))
+
+    def load_keys(self: DiskStorage, keys: list[str]) -> Iterator[tuple[str, Paper]]:
+        """Parse the paper files named <key>.json, reading them on a thread pool."""
+        paths = [self.data_dir / f"{key}.json" for key in keys]
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+            for key, paper in zip(keys, executor.map(self._load_paper, paths), strict=True):
+                if paper:
+                    yield key, paper
+
+    def stamps(self: DiskStorage) -> dict[str, str]:
+        """Stamp every paper file with its mtime and size, by file name stem."""
+        stamps = {}
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        stamps[entry.name.removesuffix(".json")] = _file_stamp(entry.stat())
+                    except OSError:
+                        continue
+        return stamps
+
+    def stamp(self: DiskStorage, paper_id: str) -> tuple[str, str]:
+        """Get a paper's file name stem and file stamp.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        path = self._get_paper_path(paper_id)
+        return path.stem, _file_stamp(path.stat())
+
+    def exists(self: DiskStorage, paper_id: str) -> bool:
+        """Check whether a paper file exists."""
+        return self._get_paper_path(paper_id).exists()
+
+    def write(self: DiskStorage, paper_id: str, data: bytes, exclusive: bool = False) -> None:
+        """Save a paper's JSON file.
+
+        The JSON is synced to ``<id>.json.tmp`` first; an update renames it
+        over the paper file, a new paper is hard-linked into place so an
+        existing file is never replaced.
+
+        Raises:
+            FileExistsError: If exclusive and the file already exists
+        """
+        path = self._get_paper_path(paper_id)
+        tmp_path = path.with_suffix(".json.tmp")
+
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        if not exclusive:
+            os.replace(tmp_path, path)
+            return
+
+        try:
+            # A hard link fails instead of replacing an existing file
+            os.link(tmp_path, path)
+        except FileExistsError:
+            os.unlink(tmp_path)
+            raise
+        except OSError:
+            # No hard links here (exFAT, many FUSE/SMB mounts): claim the name
+            # with an empty placeholder, then rename the paper over it
+            try:
+                os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            except FileExistsError:
+                os.unlink(tmp_path)
+                raise
+            os.replace(tmp_path, path)
+        else:
+            os.unlink(tmp_path)
+
+    def delete(self: DiskStorage, paper_id: str) -> None:
+        """Remove a paper's JSON file.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        self._get_paper_path(paper_id).unlink()
+
+    def close(self: DiskStorage) -> None:
+        """Nothing to release: paper files are opened per call."""
+
+    def _get_paper_path(self: DiskStorage, paper_id: str) -> Path:
+        """Get path for paper JSON file."""
+        return self.data_dir / f"{paper_id.translate(_ID_TRANS)}.json"
+
+    def _load_paper(self: DiskStorage, path: Path) -> Paper | None:
+        """Load paper from JSON file."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        paper = _load_paper_cached(os.fspath(path), stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+        return _copy_paper(paper) if paper else None
+
+
+class MemoryStorage:
+    """Papers held in a dict, for collections that needn't outlive the process."""
+
+    def __init__(self: MemoryStorage) -> None:
+        """Initialize empty storage."""
+        self._papers: dict[str, bytes] = {}
+        self._parsed: dict[str, Paper] = {}
+
+    def read(self: MemoryStorage, paper_id: str) -> bytes | None:
+        """Get a paper's JSON, or None if not stored."""
+        return self._papers.get(paper_id)
+
+    def load(self: MemoryStorage, paper_id: str) -> Paper | None:
+        """Get a parsed paper, or None if not stored.
+
+        Parsed papers are kept and shared between calls, like DiskStorage's:
+        call PaperStore.update() after modifying one.
+        """
+        paper = self._parsed.get(paper_id)
+        if paper is None and paper_id in self._papers:
+            paper = self._parsed[paper_id] = PAPER_DECODER.decode(self._papers[paper_id])
+        return paper
+
+    def load_keys(self: MemoryStorage, keys: list[str]) -> Iterator[tuple[str, Paper]]:
+        """Parse the papers with the given IDs (the storage keys)."""
+        for key in keys:
+            paper = self.load(key)
+            if paper:
+                yield key, paper
+
+    def stamps(self: MemoryStorage) -> dict[str, str]:
+        """Stamp every paper with a checksum of its JSON, by paper ID."""
+        return {paper_id: str(zlib.crc32(data)) for paper_id, data in self._papers.items()}
+
+    def stamp(self: MemoryStorage, paper_id: str) -> tuple[str, str]:
+        """Get a paper's ID and a checksum of its JSON.
+
+        Raises:
+            FileNotFoundError: If the paper is not stored
+        """
+        if paper_id not in self._papers:
+            raise FileNotFoundError(paper_id)
+        return paper_id, str(zlib.crc32(self._papers[paper_id]))
+
+    def exists(self: MemoryStorage, paper_id: str) -> bool:
+        """Check whether a paper is stored."""
+        return paper_id in self._papers
+
+    def write(self: MemoryStorage, paper_id: str, data: bytes, exclusive: bool = False) -> None:
+        """Store a paper's JSON.
+
+        Raises:
+            FileExistsError: If exclusive and the paper is already stored
+        """
+        if exclusive and paper_id in self._papers:
+            raise FileExistsError(paper_id)
+        self._papers[paper_id] = data
+        self._parsed.pop(paper_id, None)
+
+    def delete(self: MemoryStorage, paper_id: str) -> None:
+        """Remove a paper's JSON.
+
+        Raises:
+            FileNotFoundError: If the paper is not stored
+        """
+        if self._papers.pop(paper_id, None) is None:
+            raise FileNotFoundError(paper_id)
+        self._parsed.pop(paper_id, None)
+
+    def close(self: MemoryStorage) -> None:
+        """Nothing to release."""
+
+
+class LogStorage:
+    """Papers as records appended to a single <data_dir>/papers.log file.
+
+    Each line is "<paper_id>\t<paper JSON>", or "<paper_id>\t" for a
+    deletion; the last record for an ID wins. Opening scans the log for
+    where each paper's latest record is (and its checksum), without parsing
+    or keeping the JSON, and papers are read and parsed on demand, with the most recently
+    used ones cached. Adding many papers costs one append each instead of
+    a file per paper. Appends are not synced: a crash can lose the latest
+    records, never earlier ones. Call compact() to drop superseded records.
+
+    Keeps the log open: call close(), or use the storage as a context
+    manager, when done with it.
+    """
+
+    def __init__(self: LogStorage, data_dir: Path, cache_size: int = 128) -> None:
+        """Initialize storage, scanning the log if it exists.
+
+        Args:
+            data_dir: Directory holding papers.log
+            cache_size: Parsed papers kept in memory
+        """
+        self.data_dir = data_dir
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.data_dir / "papers.log"
+        self.cache_size = cache_size
+
+        # Paper ID -> (offset, length, CRC-32) of its JSON in the log
+        self._offsets: dict[str, tuple[int, int, int]] = {}
+        self._cache: OrderedDict[str, Paper] = OrderedDict()
+        self._size = self._scan()
+
+        self._open()
+
+    def read(self: LogStorage, paper_id: str) -> bytes | None:
+        """Get a paper's JSON from the log, or None if not stored."""
+        location = self._offsets.get(paper_id)
+        if location is None:
+            return None
+
+        offset, length, _ = location
+        self._reader.seek(offset)
+        return self._reader.read(length)
+
+    def load(self: LogStorage, paper_id: str) -> Paper | None:
+        """Get a parsed paper, or None if not stored or unreadable.
+
+        Recently loaded papers are cached and shared between calls: call
+        PaperStore.update() after modifying one.
+        """
+        paper = self._cache.get(paper_id)
+        if paper is not None:
+            self._cache.move_to_end(paper_id)
+            return paper
+
+        data = self.read(paper_id)
+        if data is None:
+            return None
+        try:
+            paper = PAPER_DECODER.decode(data)
+        except msgspec.DecodeError:
+            return None
+
+        self._cache[paper_id] = paper
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return paper
+
+    def load_keys(self: LogStorage, keys: list[str]) -> Iterator[tuple[str, Paper]]:
+        """Parse the papers with the given IDs (the storage keys)."""
+        for key in keys:
+            paper = self.load(key)
+            if paper:
+                yield key, paper
+
+    def stamps(self: LogStorage) -> dict[str, str]:
+        """Stamp every paper with a checksum of its latest record, by paper ID.
+
+        Checksums rather than offsets, so compacting the log changes no stamps.
+        """
+        return {paper_id: str(crc) for paper_id, (_, _, crc) in self._offsets.items()}
+
+    def stamp(self: LogStorage, paper_id: str) -> tuple[str, str]:
+        """Get a paper's ID and a checksum of its latest record.
+
+        Raises:
+            FileNotFoundError: If the paper is not stored
+        """
+        if paper_id not in self._offsets:
+            raise FileNotFoundError(paper_id)
+        return paper_id, str(self._offsets[paper_id][2])
+
+    def exists(self: LogStorage, paper_id: str) -> bool:
+        """Check whether a paper is stored."""
+        return paper_id in self._offsets
+
+    def write(self: LogStorage, paper_id: str, data: bytes, exclusive: bool = False) -> None:
+        """Append a paper's JSON to the log.
+
+        Raises:
+            FileExistsError: If exclusive and the paper is already stored
+        """
+        if exclusive and paper_id in self._offsets:
+            raise FileExistsError(paper_id)
+
+        key = paper_id.encode() + b"\t"
+        _write_all(self._log_fd, key + data + b"\n")
+        self._offsets[paper_id] = (self._size + len(key), len(data), zlib.crc32(data))
+        self._size += len(key) + len(data) + 1
+        self._cache.pop(paper_id, None)
+
+    def delete(self: LogStorage, paper_id: str) -> None:
+        """Append a deletion record to the log.
+
+        Raises:
+            FileNotFoundError: If the paper is not stored
+        """
+        if paper_id not in self._offsets:
+            raise FileNotFoundError(paper_id)
+
+        record = paper_id.encode() + b"\t\n"
+        _write_all(self._log_fd, record)
+        self._size += len(record)
+        del self._offsets[paper_id]
+        self._cache.pop(paper_id, None)
+
+    def close(self: LogStorage) -> None:
+        """Close the log's file handles."""
+        if self._log_fd >= 0:
+            os.close(self._log_fd)
+            self._log_fd = -1
+        self._reader.close()
+
+    def __enter__(self: LogStorage) -> LogStorage:
+        return self
+
+    def __exit__(self: LogStorage, *_: object) -> None:
+        self.close()
+
+    def compact(self: LogStorage) -> None:
+        """Rewrite the log with only the latest record of each stored paper."""
+        tmp_path = self.log_path.with_suffix(".log.tmp")
+        offsets: dict[str, tuple[int, int, int]] = {}
+        records = []
+        size = 0
+        for paper_id, (_, _, crc) in self._offsets.items():
+            key = paper_id.encode() + b"\t"
+            data = self.read(paper_id) or b""
+            offsets[paper_id] = (size + len(key), len(data), crc)
+            records.append(key + data + b"\n")
+            size += len(key) + len(data) + 1
+
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, b"".join(records))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        os.replace(tmp_path, self.log_path)
+        self.close()
+        self._open()
+        self._offsets = offsets
+        self._size = size
+
+    def _open(self: LogStorage) -> None:
+        """Open the log for appending records and for reading them back."""
+        # A raw descriptor in append mode: each record goes to the end of
+        # the log through os.write() calls, with nothing left in a buffer
+        self._log_fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # Owned by the storage for its lifetime and closed in close()
+        self._reader = open(self.log_path, "rb")  # noqa: SIM115
+
+    def _scan(self: LogStorage) -> int:
+        """Find the latest record of each paper in the log.
+
+        Returns:
+            Size of the log after dropping any torn last record
+        """
+        offset = 0
+        try:
+            with open(self.log_path, "rb") as log:
+                for line in log:
+                    if not line.endswith(b"\n"):
+                        # Drop a record torn by a crash, so the next append starts a fresh line
+                        os.truncate(self.log_path, offset)
+                        break
+
+                    paper_id, _, data = line.partition(b"\t")
+                    if len(data) > 1:
+                        data = data[:-1]
+                        self._offsets[paper_id.decode()] = (offset + len(paper_id) + 1, len(data), zlib.crc32(data))
+                    else:
+                        self._offsets.pop(paper_id.decode(), None)
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+
+        return offset
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd, continuing after short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _file_stamp(stat: os.stat_result) -> str:
+    """Stamp a paper file with its inode, mtime, ctime, and size.
+
+    Writes rename a new file into place, so the inode and ctime change even
+    when a same-size rewrite lands within one mtime tick.
+    """
+    return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_ctime_ns}:{stat.st_size}"
+
+
+@lru_cache(maxsize=4096)
+def _load_paper_cached(path_str: str, ino: int, mtime_ns: int, ctime_ns: int, size: int) -> Paper | None:
+    """Load paper from JSON file, reusing the parsed paper while the file is unchanged.
+
+    The stat fields are part of the cache key only. Writes rename a new file
+    into place, so even an edit of the same size within one mtime tick
+    changes the inode and the entry is missed. Callers must copy the
+    returned paper before handing it out.
+    """
+    try:
+        if size < _MMAP_MIN_SIZE:
+            return PAPER_DECODER.decode(Path(path_str).read_bytes())
+
+        with (
+            open(path_str, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            return PAPER_DECODER.decode(view)
+    except (OSError, msgspec.DecodeError):
+        return None
+
+
+def _copy_paper(paper: Paper) -> Paper:
+    """Copy paper, including its lists and insights (strings are shared)."""
+    insights = paper.insights
+    if insights:
+        insights = replace(
+            insights,
+            contributions=list(insights.contributions),
+            related_work=list(insights.related_work),
+            future_directions=list(insights.future_directions),
+        )
+    return replace(paper, authors=list(paper.authors), interests=list(paper.interests), insights=insights)
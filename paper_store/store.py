@@ -2,31 +2,152 @@
 
 from __future__ import annotations
 
-import json
-from dataclasses import asdict
+import re
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import Literal
 
-if TYPE_CHECKING:
-    from models import Paper
+import msgspec
+import orjson
+
+from models import Paper
+from models import PaperSummary
+from paper_store.storage import PAPER_DECODER
+from paper_store.storage import DiskStorage
+from paper_store.storage import LogStorage
+from paper_store.storage import MemoryStorage
+from paper_store.storage import Storage
+
+# Words worth indexing: 3+ characters, starting with a letter (any script)
+_TOKEN_RE = re.compile(r"[^\W\d_][\w-]{2,}")
+
+# Words of a query, indexable or not
+_WORD_RE = re.compile(r"\w[\w-]*")
+
+# Bump when the index schema or tokenization changes; older indexes are rebuilt
+_INDEX_VERSION = 10
+
+# Common English words left out of the search index
+_STOPWORDS = frozenset(
+    {
+        "about", "above", "after", "again", "all", "also", "among", "and", "any", "are", "based", "been",
+        "before", "being", "between", "both", "but", "can", "could", "does", "doing", "during", "each",
+        "for", "from", "further", "had", "has", "have", "having", "her", "here", "his", "how", "into",
+        "its", "more", "most", "not", "now", "off", "once", "only", "other", "our", "out", "over", "own",
+        "same", "she", "should", "some", "such", "than", "that", "the", "their", "them", "then", "there",
+        "these", "they", "this", "those", "through", "too", "under", "until", "use", "used", "using",
+        "very", "was", "were", "what", "when", "where", "which", "while", "who", "why", "will", "with",
+        "would", "you", "your",
+    }
+)  # fmt: skip
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercase text and split into indexable words, dropping stopwords."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _search_fields(paper: Paper) -> list[str]:
+    """Searchable text of a paper, one string per index column.
+
+    List fields (authors, contributions, ...) are newline-joined.
+    """
+    insights = paper.insights
+    if not insights:
+        return [paper.title, "\n".join(paper.authors), "", "", "", "", "", ""]
+
+    return [
+        paper.title,
+        "\n".join(paper.authors),
+        insights.problem,
+        insights.method,
+        insights.key_results,
+        "\n".join(insights.contributions),
+        "\n".join(insights.related_work),
+        "\n".join(insights.future_directions),
+    ]
+
+
+def _haystack(fields: list[str]) -> bytes:
+    """Casefold search fields into one blob for substring search.
+
+    Encoded as UTF-8 so SQLite's instr() compares bytes rather than
+    decoding characters; a byte match of UTF-8 text is always a match of
+    whole characters.
+    """
+    # Newline-separated so a match can't span two fields
+    return "\n".join(fields).casefold().encode()
+
+
+def to_pretty_json(paper: Paper) -> str:
+    """Serialize paper as indented JSON for display.
+
+    Paper files are stored compact; use this when showing one to a person.
+    """
+    return orjson.dumps(paper, option=orjson.OPT_INDENT_2).decode()
 
 
 class PaperStore:
     """Manages paper collection storage.
 
-    Papers stored as JSON files in .data/papers/<paper_id>.json
+    Papers stored as JSON files in .data/papers/<paper_id>.json (or in
+    memory, see Storage). An SQLite database in .data/papers/index.sqlite
+    holds a copy of every paper (so the collection loads in one query) and an
+    FTS5 search index. It is rebuilt from the paper files if missing or
+    outdated, and on open any paper file added, edited, or removed since it
+    was indexed (by hand, by a restore, or by a crash mid-write) is
+    re-indexed: the paper files stay the source of truth.
+
+    Call close(), or use the store as a context manager, to close the index
+    database and storage when done.
     """
 
-    def __init__(self: PaperStore, data_dir: Path | None = None) -> None:
+    def __init__(
+        self: PaperStore,
+        data_dir: Path | None = None,
+        index_path: Path | str | None = None,
+        storage: Literal["disk", "log", "memory"] | Storage = "disk",
+    ) -> None:
         """Initialize store.
 
         Args:
-            data_dir: Base directory (default: .data/papers)
+            data_dir: Base directory for disk or log storage (default: .data/papers)
+            index_path: Index database file, or ":memory:" to build the index
+                in memory on every open (default: <data_dir>/index.sqlite for
+                disk or log storage, in memory otherwise)
+            storage: "disk" for paper files in data_dir, "log" for a single
+                append-only log in data_dir, "memory" to keep papers and
+                index in memory only, or a Storage instance
+
+        Raises:
+            ValueError: If storage is not a known backend name
         """
-        if data_dir is None:
-            data_dir = Path.home() / ".data" / "papers"
-        self.data_dir = data_dir
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.data_dir: Path | None = None
+        if storage in ("disk", "log"):
+            self.data_dir = data_dir or Path.home() / ".data" / "papers"
+            self.storage: Storage = (DiskStorage if storage == "disk" else LogStorage)(self.data_dir)
+            if index_path is None:
+                index_path = self.data_dir / "index.sqlite"
+        elif storage == "memory":
+            self.storage = MemoryStorage()
+            index_path = ":memory:"
+        elif isinstance(storage, str):
+            raise ValueError(f"Unknown storage {storage!r}: expected 'disk', 'log', 'memory', or a Storage")
+        else:
+            self.storage = storage
+
+        self._index = sqlite3.connect(index_path or ":memory:", isolation_level=None)
+        # The index can be rebuilt from storage (see _sync_index), so commits
+        # needn't wait for an fsync: WAL with synchronous=NORMAL still never
+        # corrupts it, at worst losing the last commits on power loss
+        self._index.execute("PRAGMA journal_mode = WAL")
+        self._index.execute("PRAGMA synchronous = NORMAL")
+        self._savepoints: list[Savepoint] = []
+        if self._index.execute("PRAGMA user_version").fetchone()[0] != _INDEX_VERSION:
+            self._create_index()
+        self._sync_index()
 
     def add(self: PaperStore, paper: Paper) -> None:
         """Add paper to collection.
@@ -37,11 +158,15 @@ class PaperStore:
         Raises:
             ValueError: If paper already exists
         """
-        path = self._get_paper_path(paper.id)
-        if path.exists():
-            raise ValueError(f"Paper {paper.id} already exists")
+        data = orjson.dumps(paper)
+        self._remember(paper.id)
+        try:
+            self.storage.write(paper.id, data, exclusive=True)
+        except FileExistsError as e:
+            raise ValueError(f"Paper {paper.id} already exists") from e
 
-        self._save_paper(paper, path)
+        with self._transaction():
+            self._index_paper(paper, data, *self.storage.stamp(paper.id))
 
     def get(self: PaperStore, paper_id: str) -> Paper | None:
         """Get paper by ID.
@@ -52,26 +177,33 @@ class PaperStore:
         Returns:
             Paper if found, None otherwise
         """
-        path = self._get_paper_path(paper_id)
-        if not path.exists():
-            return None
-
-        return self._load_paper(path)
+        return self.storage.load(paper_id)
 
     def update(self: PaperStore, paper: Paper) -> None:
         """Update existing paper.
 
+        Nothing is written if the paper is unchanged since it was stored.
+
         Args:
             paper: Paper with updated data
 
         Raises:
             ValueError: If paper doesn't exist
         """
-        path = self._get_paper_path(paper.id)
-        if not path.exists():
+        if not self.storage.exists(paper.id):
             raise ValueError(f"Paper {paper.id} not found")
 
-        self._save_paper(paper, path)
+        # The index keeps each paper's serialized JSON: compare against it
+        data = orjson.dumps(paper)
+        stored = self._index.execute("SELECT blob FROM papers WHERE paper_id = ?", (paper.id,)).fetchone()
+        if stored and stored[0] == data:
+            return
+
+        self._remember(paper.id)
+        self.storage.write(paper.id, data)
+        with self._transaction():
+            self._unindex_paper(paper.id)
+            self._index_paper(paper, data, *self.storage.stamp(paper.id))
 
     def delete(self: PaperStore, paper_id: str) -> None:
         """Delete paper from collection.
@@ -82,11 +214,14 @@ class PaperStore:
         Raises:
             ValueError: If paper doesn't exist
         """
-        path = self._get_paper_path(paper_id)
-        if not path.exists():
-            raise ValueError(f"Paper {paper_id} not found")
+        self._remember(paper_id)
+        try:
+            self.storage.delete(paper_id)
+        except FileNotFoundError as e:
+            raise ValueError(f"Paper {paper_id} not found") from e
 
-        path.unlink()
+        with self._transaction():
+            self._unindex_paper(paper_id)
 
     def list_all(self: PaperStore) -> list[Paper]:
         """List all papers in collection.
@@ -95,60 +230,277 @@ class PaperStore:
             List of all papers
         """
         papers = []
-        for path in self.data_dir.glob("*.json"):
-            paper = self._load_paper(path)
-            if paper:
-                papers.append(paper)
+        for (blob,) in self._index.execute("SELECT blob FROM papers"):
+            try:
+                papers.append(PAPER_DECODER.decode(blob))
+            except msgspec.DecodeError:
+                continue
 
         return papers
 
-    def search(self: PaperStore, query: str) -> list[Paper]:
-        """Search papers by text in title, abstract, or insights.
+    def list_summaries(self: PaperStore) -> list[PaperSummary]:
+        """List id, title, status, and classification of all papers.
 
-        Args:
-            query: Search query (case-insensitive)
+        Read from the index database's columns, without parsing any paper
+        JSON, so listings stay cheap for large collections.
 
         Returns:
-            List of matching papers
+            List of paper summaries
         """
-        query_lower = query.lower()
-        results = []
+        rows = self._index.execute("SELECT paper_id, title, status, classification FROM papers")
+        return [PaperSummary._make(row) for row in rows]
 
-        for paper in self.list_all():
-            if query_lower in paper.title.lower():
-                results.append(paper)
-                continue
+    def search(self: PaperStore, query: str) -> list[Paper]:
+        """Search papers by text in title, authors, or insights.
 
-            if hasattr(paper, "insights") and paper.insights:
-                insights_text = (paper.insights.problem + paper.insights.method + paper.insights.key_results).lower()
+        A paper matches if the query appears in its title, authors, or
+        insights as a substring ("ention" matches "attention"), or if every
+        query word appears there as a word prefix, in any order and field.
+        Queries with a word too short or numeric to be indexed ("RL", "4G")
+        match as substrings only, so that word still has to match.
 
-                if query_lower in insights_text:
-                    results.append(paper)
+        Args:
+            query: Search query (case-insensitive)
 
-        return results
+        Returns:
+            List of matching papers, best word matches first, then
+            substring-only matches
+        """
+        results: dict[str, Paper] = {}
+        tokens = _tokenize(query)
+        if tokens and all(_TOKEN_RE.fullmatch(word) for word in _WORD_RE.findall(query.lower())):
+            match = " ".join(f'"{token}"*' for token in tokens)
+            rows = self._index.execute(
+                "SELECT papers.paper_id, papers.blob FROM papers_fts JOIN papers ON papers.rowid = papers_fts.rowid "
+                "WHERE papers_fts MATCH ? ORDER BY papers_fts.rank",
+                (match,),
+            )
+            for paper_id, blob in rows:
+                try:
+                    results[paper_id] = PAPER_DECODER.decode(blob)
+                except msgspec.DecodeError:
+                    continue
+
+        for paper in self._scan(query):
+            results.setdefault(paper.id, paper)
+
+        return list(results.values())
+
+    def close(self: PaperStore) -> None:
+        """Close the index database and the storage (including a Storage passed in)."""
+        self._index.close()
+        self.storage.close()
+
+    def __enter__(self: PaperStore) -> PaperStore:
+        return self
+
+    def __exit__(self: PaperStore, *_: object) -> None:
+        self.close()
+
+    def begin_nested(self: PaperStore) -> Savepoint:
+        """Start a savepoint that can undo later changes to the collection.
+
+        Leaving the savepoint's context releases it (keeping the changes),
+        or rolls it back if the block raised. Savepoints can be nested.
+
+        Example:
+            with store.begin_nested() as savepoint:
+                store.add(paper)
+                savepoint.rollback()  # stored paper and index rows are gone
 
-    def _get_paper_path(self: PaperStore, paper_id: str) -> Path:
-        """Get path for paper JSON file."""
-        safe_id = paper_id.replace(":", "_").replace("/", "_")
-        return self.data_dir / f"{safe_id}.json"
+        Returns:
+            Savepoint, to be used as a context manager
+        """
+        savepoint = Savepoint(self, f"nested_{len(self._savepoints)}")
+        self._index.execute(f"SAVEPOINT {savepoint.name}")
+        self._savepoints.append(savepoint)
+        return savepoint
+
+    def _scan(self: PaperStore, query: str) -> list[Paper]:
+        """Search papers by case-insensitive substring match."""
+        if len(query) >= 3:
+            # Trigram index: a quoted phrase matches as a case-insensitive substring
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self._index.execute(
+                "SELECT blob FROM papers_trigram JOIN papers ON papers.rowid = papers_trigram.rowid "
+                "WHERE papers_trigram MATCH ?",
+                (phrase,),
+            )
+        else:
+            # Too short for trigrams: scan the casefolded haystacks
+            rows = self._index.execute("SELECT blob FROM papers WHERE instr(haystack, ?)", (query.casefold().encode(),))
 
-    def _save_paper(self: PaperStore, paper: Paper, path: Path) -> None:
-        """Save paper to JSON file."""
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(asdict(paper), f, indent=2, ensure_ascii=False)
+        results = []
+        for (blob,) in rows:
+            try:
+                results.append(PAPER_DECODER.decode(blob))
+            except msgspec.DecodeError:
+                continue
 
-    def _load_paper(self: PaperStore, path: Path) -> Paper | None:
-        """Load paper from JSON file."""
-        from models import Paper
-        from models import PaperInsights
+        return results
 
+    def _create_index(self: PaperStore) -> None:
+        """Recreate the index database's tables, empty."""
+        with self._transaction():
+            self._index.execute("DROP TABLE IF EXISTS papers")
+            self._index.execute("DROP TABLE IF EXISTS papers_fts")
+            self._index.execute("DROP TABLE IF EXISTS papers_trigram")
+            self._index.execute(
+                "CREATE TABLE papers (paper_id TEXT PRIMARY KEY, key TEXT NOT NULL UNIQUE, stamp TEXT NOT NULL, "
+                "title TEXT NOT NULL, status TEXT NOT NULL, classification TEXT, blob BLOB NOT NULL, "
+                "haystack BLOB NOT NULL)"
+            )
+            self._index.execute(
+                "CREATE VIRTUAL TABLE papers_fts "
+                "USING fts5(paper_id UNINDEXED, title, authors, problem, method, key_results, contributions, "
+                "related_work, future_directions, "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            self._index.execute(
+                "CREATE VIRTUAL TABLE papers_trigram USING fts5(paper_id UNINDEXED, text, tokenize='trigram')"
+            )
+            self._index.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+
+    def _sync_index(self: PaperStore) -> None:
+        """Re-index stored papers whose stamps differ from their index rows.
+
+        Stamps are compared, not schema versions, so papers changed outside
+        the store are picked up; an empty index gets every paper.
+        """
+        stamps = self.storage.stamps()
+        indexed = dict(self._index.execute("SELECT key, stamp FROM papers"))
+        stale = [key for key, stamp in stamps.items() if indexed.get(key) != stamp]
+        removed = [key for key in indexed if key not in stamps]
+        if not stale and not removed:
+            return
+
+        with self._transaction():
+            for key in removed + stale:
+                row = self._index.execute("SELECT paper_id FROM papers WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._unindex_paper(row[0])
+            for key, paper in self.storage.load_keys(stale):
+                self._unindex_paper(paper.id)
+                self._index_paper(paper, orjson.dumps(paper), key, stamps[key])
+
+    @contextmanager
+    def _transaction(self: PaperStore) -> Iterator[None]:
+        """Apply the index changes of a block together, or not at all.
+
+        A savepoint rather than BEGIN, so it also works inside begin_nested();
+        outside any transaction it commits once, on release.
+        """
+        self._index.execute("SAVEPOINT index_write")
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
+            yield
+        except BaseException:
+            self._index.execute("ROLLBACK TO index_write")
+            self._index.execute("RELEASE index_write")
+            raise
+        self._index.execute("RELEASE index_write")
+
+    def _index_paper(self: PaperStore, paper: Paper, data: bytes, key: str, stamp: str) -> None:
+        """Add paper, serialized as data and stored under key with stamp, to the index database.
+
+        Its FTS rows share the papers row's rowid, so they can be found
+        without scanning the FTS tables.
+        """
+        fields = _search_fields(paper)
+        rowid = self._index.execute(
+            "INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                paper.id,
+                key,
+                stamp,
+                paper.title,
+                paper.status,
+                paper.insights.classification if paper.insights else None,
+                data,
+                _haystack(fields),
+            ),
+        ).lastrowid
+        self._index.execute(
+            "INSERT INTO papers_fts (rowid, paper_id, title, authors, problem, method, key_results, contributions, "
+            "related_work, future_directions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (rowid, paper.id, *(" ".join(_tokenize(text)) for text in fields)),
+        )
+        self._index.execute(
+            "INSERT INTO papers_trigram (rowid, paper_id, text) VALUES (?, ?, ?)", (rowid, paper.id, "\n".join(fields))
+        )
+
+    def _unindex_paper(self: PaperStore, paper_id: str) -> None:
+        """Remove paper from the index database."""
+        row = self._index.execute("SELECT rowid FROM papers WHERE paper_id = ?", (paper_id,)).fetchone()
+        if row:
+            self._index.execute("DELETE FROM papers WHERE rowid = ?", row)
+            self._index.execute("DELETE FROM papers_fts WHERE rowid = ?", row)
+            self._index.execute("DELETE FROM papers_trigram WHERE rowid = ?", row)
+
+    def _remember(self: PaperStore, paper_id: str) -> None:
+        """Record a paper's stored JSON before changing it, if in a savepoint."""
+        if self._savepoints and paper_id not in self._savepoints[-1].papers:
+            self._savepoints[-1].papers[paper_id] = self.storage.read(paper_id)
+
+
+class Savepoint:
+    """Changes to a PaperStore since PaperStore.begin_nested().
+
+    Attributes:
+        name: SQL savepoint name
+        papers: Original JSON of papers changed since the savepoint, by ID
+            (None for papers that were not stored)
+    """
 
-            if "insights" in data and data["insights"]:
-                data["insights"] = PaperInsights(**data["insights"])
+    def __init__(self: Savepoint, store: PaperStore, name: str) -> None:
+        """Initialize savepoint.
 
-            return Paper(**data)
-        except Exception:
-            return None
+        Args:
+            store: Store the savepoint belongs to
+            name: SQL savepoint name
+        """
+        self.name = name
+        self.papers: dict[str, bytes | None] = {}
+        self._store = store
+        self._active = True
+
+    def __enter__(self: Savepoint) -> Savepoint:
+        return self
+
+    def __exit__(self: Savepoint, exc_type: type[BaseException] | None, *_: object) -> None:
+        if not self._active:
+            return
+        if exc_type is None:
+            self.release()
+        else:
+            self.rollback()
+
+    def release(self: Savepoint) -> None:
+        """Keep the changes, handing them to the enclosing savepoint if any."""
+        self._close()
+        self._store._index.execute(f"RELEASE {self.name}")
+
+        if self._store._savepoints:
+            outer = self._store._savepoints[-1].papers
+            for paper_id, data in self.papers.items():
+                outer.setdefault(paper_id, data)
+
+    def rollback(self: Savepoint) -> None:
+        """Undo the changes: restore stored papers and index rows."""
+        self._close()
+        self._store._index.execute(f"ROLLBACK TO {self.name}")
+        self._store._index.execute(f"RELEASE {self.name}")
+
+        storage = self._store.storage
+        for paper_id, data in self.papers.items():
+            if data is not None:
+                storage.write(paper_id, data)
+            elif storage.exists(paper_id):
+                storage.delete(paper_id)
+
+    def _close(self: Savepoint) -> None:
+        """Remove the savepoint from the store, which must be innermost."""
+        if not self._active or self._store._savepoints[-1] is not self:
+            raise ValueError(f"Savepoint {self.name} is not the innermost open savepoint")
+
+        self._store._savepoints.pop()
+        self._active = False
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
-import json
-from dataclasses import asdict
+import atexit
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import msgspec
+import orjson
+
+# Minimum time between unforced saves to the same state file (250 ms)
+SAVE_INTERVAL_NS = 250_000_000
+
 
 @dataclass
 class SessionState:
@@ -29,27 +35,52 @@ class SessionState:
     data: dict[str, Any] | None = None
 
     def __post_init__(self: SessionState) -> None:
-        """Initialize data dict if None."""
+        """Initialize data dict if None, and the save throttle."""
         if self.data is None:
             self.data = {}
 
-    def save(self: SessionState, base_path: Path | None = None) -> None:
+        # Not fields, so never serialized: monotonic time of the last save to
+        # each base path, and base paths whose latest save was skipped
+        self._last_save_ns: dict[Path, int] = {}
+        self._unsaved: set[Path] = set()
+
+    def save(self: SessionState, base_path: Path | None = None, force: bool = False) -> None:
         """Save session state to JSON file.
 
+        A save less than SAVE_INTERVAL_NS after the previous one to the same
+        base path is skipped, so progress can be saved in a loop. Skipped
+        saves are written by flush(), which runs at interpreter exit.
+
         Args:
             base_path: Base directory for session data (default: .data/paper_reader)
+            force: Save even if the previous save was too recent
         """
         if base_path is None:
             base_path = Path(".data/paper_reader")
 
+        now_ns = time.monotonic_ns()
+        last_ns = self._last_save_ns.get(base_path)
+        if not force and last_ns is not None and now_ns - last_ns < SAVE_INTERVAL_NS:
+            if not self._unsaved:
+                atexit.register(self.flush)
+            self._unsaved.add(base_path)
+            return
+
         session_dir = base_path / self.session_id
         session_dir.mkdir(parents=True, exist_ok=True)
 
         state_file = session_dir / "state.json"
         self.last_updated = datetime.now().isoformat()
 
-        with open(state_file, "w") as f:
-            json.dump(asdict(self), f, indent=2)
+        state_file.write_bytes(orjson.dumps(self, option=orjson.OPT_NON_STR_KEYS))
+        self._last_save_ns[base_path] = now_ns
+        self._unsaved.discard(base_path)
+
+    def flush(self: SessionState) -> None:
+        """Write the state to every base path whose latest save was skipped."""
+        for base_path in list(self._unsaved):
+            self.save(base_path, force=True)
+        atexit.unregister(self.flush)
 
     @classmethod
     def load(cls: type[SessionState], session_id: str, base_path: Path | None = None) -> SessionState | None:
@@ -65,13 +96,12 @@ class SessionState:
         if base_path is None:
             base_path = Path(".data/paper_reader")
 
-        state_file = base_path / session_id / "state.json"
-        if not state_file.exists():
+        try:
+            raw = (base_path / session_id / "state.json").read_bytes()
+        except FileNotFoundError:
             return None
 
-        with open(state_file) as f:
-            data = json.load(f)
-            return cls(**data)
+        return msgspec.json.decode(raw, type=cls)
 
     @staticmethod
     def get_session_dir(session_id: str, base_path: Path | None = None) -> Path:
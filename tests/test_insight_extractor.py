@@ -5,12 +5,13 @@ from unittest.mock import patch
 
 import pytest
 from insight_extractor import InsightExtractor
+from insight_extractor.extractor import STATIC_INSTRUCTIONS
 
 
 @pytest.fixture
-def extractor():
+def extractor(tmp_path):
     """Create insight extractor."""
-    return InsightExtractor()
+    return InsightExtractor(cache_dir=tmp_path / "insight_cache")
 
 
 @pytest.fixture
@@ -38,9 +39,10 @@ def test_build_extraction_prompt(extractor, sample_paper_text):
     prompt = extractor._build_extraction_prompt(title="Sparse Attention Mechanisms", text=sample_paper_text)
 
     assert "Sparse Attention Mechanisms" in prompt
-    assert "PROBLEM" in prompt
-    assert "METHOD" in prompt
-    assert "JSON" in prompt
+    assert "PROBLEM" in STATIC_INSTRUCTIONS
+    assert "METHOD" in STATIC_INSTRUCTIONS
+    assert "JSON" in STATIC_INSTRUCTIONS
+    assert STATIC_INSTRUCTIONS not in prompt
 
 
 def test_build_extraction_prompt_truncates_long_text(extractor):
@@ -92,6 +94,51 @@ def test_parse_response_with_markdown_wrapper(extractor):
     assert insights.classification == "incremental"
 
 
+def test_parse_response_with_plain_fence_and_prose(extractor):
+    """Test parsing response with untagged code block surrounded by prose."""
+    response = """Here are the insights:
+    ```
+    {
+        "problem": "Test problem",
+        "method": "Test method",
+        "key_results": "Test results",
+        "contributions": ["Contribution 1"],
+        "related_work": ["Related 1"],
+        "future_directions": ["Future 1"],
+        "classification": "incremental"
+    }
+    ```
+    Let me know if you need more detail."""
+
+    insights = extractor._parse_response(response)
+
+    assert insights.method == "Test method"
+    assert insights.contributions == ["Contribution 1"]
+
+
+def test_parse_response_with_two_fenced_blocks(extractor):
+    """Test only the first fenced block is parsed when there are several."""
+    response = """```json
+    {
+        "problem": "First problem",
+        "method": "First method",
+        "key_results": "First results",
+        "contributions": [],
+        "related_work": [],
+        "future_directions": [],
+        "classification": "foundational"
+    }
+    ```
+    An alternative reading:
+    ```json
+    {"problem": "Second problem"}
+    ```"""
+
+    insights = extractor._parse_response(response)
+
+    assert insights.problem == "First problem"
+
+
 def test_parse_response_invalid_json(extractor):
     """Test parsing invalid JSON raises error."""
     response = "This is not JSON"
@@ -100,8 +147,13 @@ def test_parse_response_invalid_json(extractor):
         extractor._parse_response(response)
 
 
-@patch("insight_extractor.extractor.ClaudeCode")
-def test_extract(mock_claude_class, extractor, sample_paper_text):
+def _mock_message(text: str) -> Mock:
+    """Create a Messages API response holding a single text block."""
+    return Mock(content=[Mock(type="text", text=text)])
+
+
+@patch("insight_extractor.extractor.anthropic")
+def test_extract(mock_anthropic, extractor, sample_paper_text):
     """Test full extraction workflow."""
     # Mock Claude response
     mock_response = """{
@@ -114,9 +166,7 @@ def test_extract(mock_claude_class, extractor, sample_paper_text):
         "classification": "foundational"
     }"""
 
-    mock_claude = Mock()
-    mock_claude.generate.return_value = mock_response
-    mock_claude_class.return_value = mock_claude
+    mock_anthropic.Anthropic.return_value.messages.create.return_value = _mock_message(mock_response)
 
     # Extract insights
     insights = extractor.extract(paper_text=sample_paper_text, paper_title="Sparse Attention")
@@ -124,3 +174,79 @@ def test_extract(mock_claude_class, extractor, sample_paper_text):
     assert insights.problem == "Efficient attention mechanisms"
     assert insights.method == "Sparse attention patterns"
     assert insights.classification == "foundational"
+
+    # Instructions go as a cached system block, the paper as the user message
+    kwargs = mock_anthropic.Anthropic.return_value.messages.create.call_args.kwargs
+    assert kwargs["system"] == [
+        {"type": "text", "text": STATIC_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}}
+    ]
+    assert kwargs["messages"] == [
+        {"role": "user", "content": extractor._build_extraction_prompt("Sparse Attention", sample_paper_text)}
+    ]
+
+
+@patch("insight_extractor.extractor.anthropic")
+def test_extract_survives_failed_cache_write(mock_anthropic, extractor, sample_paper_text, monkeypatch):
+    """Test insights are returned even if they can't be cached."""
+    mock_anthropic.Anthropic.return_value.messages.create.return_value = _mock_message("""{
+        "problem": "Uncached problem",
+        "method": "Method",
+        "key_results": "Results",
+        "contributions": [],
+        "related_work": [],
+        "future_directions": [],
+        "classification": "incremental"
+    }""")
+
+    def fail_replace(src, dst):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr("insight_extractor.extractor.os.replace", fail_replace)
+    insights = extractor.extract(paper_text=sample_paper_text, paper_title="Sparse Attention")
+
+    assert insights.problem == "Uncached problem"
+    assert list(extractor.cache_dir.iterdir()) == []
+
+
+def test_extract_uses_cache(extractor, sample_paper_text):
+    """Test cached insights are returned without calling Claude."""
+    cache_path = extractor._get_cache_path("Sparse Attention", sample_paper_text)
+    cache_path.write_text("""{
+        "problem": "Cached problem",
+        "method": "Cached method",
+        "key_results": "Cached results",
+        "contributions": [],
+        "related_work": [],
+        "future_directions": [],
+        "classification": "incremental"
+    }""")
+
+    insights = extractor.extract(paper_text=sample_paper_text, paper_title="Sparse Attention")
+
+    assert insights.problem == "Cached problem"
+
+
+@patch("insight_extractor.extractor.anthropic", None)
+def test_extract_ignores_incomplete_cache(extractor, sample_paper_text):
+    """Test a cache entry missing fields is treated as not cached."""
+    cache_path = extractor._get_cache_path("Sparse Attention", sample_paper_text)
+    cache_path.write_text('{"problem": "Cached problem"}')
+
+    with pytest.raises(ValueError, match="not installed"):
+        extractor.extract(paper_text=sample_paper_text, paper_title="Sparse Attention")
+
+
+def test_cache_key_depends_on_title_and_text(extractor, sample_paper_text):
+    """Test cache entries are keyed by both title and paper text."""
+    path = extractor._get_cache_path("Sparse Attention", sample_paper_text)
+
+    assert path == extractor._get_cache_path("Sparse Attention", sample_paper_text)
+    assert path != extractor._get_cache_path("Dense Attention", sample_paper_text)
+    assert path != extractor._get_cache_path("Sparse Attention", sample_paper_text + "more")
+
+
+@patch("insight_extractor.extractor.anthropic", None)
+def test_extract_without_sdk(extractor, sample_paper_text):
+    """Test missing Anthropic SDK gives a clear error."""
+    with pytest.raises(ValueError, match="SDK is not installed"):
+        extractor.extract(paper_text=sample_paper_text, paper_title="Sparse Attention")
@@ -68,6 +68,37 @@ def test_discover_command(mock_discoverer, runner, temp_data_dir):
     assert "Test Paper" in result.output
 
 
+@patch("paper_reader.main.paper_store")
+@patch("paper_reader.main.extractor")
+@patch("paper_reader.main.ingestor")
+@patch("paper_reader.main.discoverer")
+def test_add_many_command(mock_discoverer, mock_ingestor, mock_extractor, mock_store, runner, temp_data_dir):
+    """Test add-many adds found papers and reports missing ones."""
+
+    def get_by_id(arxiv_id):
+        if arxiv_id == "9999.99999":
+            return None
+        candidate = Mock()
+        candidate.id = f"arxiv:{arxiv_id}"
+        candidate.title = f"Paper {arxiv_id}"
+        candidate.authors = ["Author One"]
+        candidate.url = f"https://arxiv.org/abs/{arxiv_id}"
+        return candidate
+
+    mock_discoverer.get_by_id.side_effect = get_by_id
+    mock_ingestor.ingest_from_arxiv.return_value = ("/tmp/paper.pdf", "Paper text")
+    mock_extractor.extract.return_value = Mock(problem="Problem", classification="incremental")
+
+    result = runner.invoke(cli, ["add-many", "2301.00001", "2301.00002", "9999.99999"])
+
+    assert result.exit_code == 0
+    assert "Paper 2301.00001" in result.output
+    assert "Paper 2301.00002" in result.output
+    assert "9999.99999: Paper 9999.99999 not found" in result.output
+    assert "Added 2 of 3 papers" in result.output
+    assert mock_store.add.call_count == 2
+
+
 def test_search_not_found(runner, temp_data_dir):
     """Test search with no results."""
     result = runner.invoke(cli, ["search", "nonexistent"])
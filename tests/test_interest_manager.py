@@ -2,6 +2,7 @@
 
 import pytest
 from interest_manager import InterestManager
+from interest_manager import manager
 from models import ResearchInterests
 
 
@@ -109,3 +110,94 @@ def test_remove_nonexistent(temp_manager):
     temp_manager.remove_area("nonexistent")
     temp_manager.remove_topic("nonexistent")
     temp_manager.remove_category("nonexistent")
+
+
+def test_batch_saves_once(temp_manager, monkeypatch):
+    """Test batch applies all changes with a single save."""
+    saves = []
+    original_save = temp_manager.save
+    monkeypatch.setattr(temp_manager, "save", lambda interests: saves.append(1) or original_save(interests))
+
+    with temp_manager.batch():
+        temp_manager.add_area("deep learning")
+        temp_manager.add_topic("attention")
+        temp_manager.add_topic("MIMO")
+        temp_manager.add_category("cs.LG")
+
+    assert len(saves) == 1
+    interests = temp_manager.load()
+    assert interests.areas == ["deep learning"]
+    assert interests.topics == ["attention", "MIMO"]
+    assert interests.arxiv_categories == ["cs.LG"]
+
+
+def test_batch_without_changes_does_not_save(temp_manager):
+    """Test batch with no effective changes leaves no file behind."""
+    with temp_manager.batch():
+        temp_manager.remove_area("nonexistent")
+
+    assert temp_manager.load() is None
+
+
+def test_load_cached_until_file_changes(temp_manager, monkeypatch):
+    """Test load reuses parsed interests until the file changes."""
+    temp_manager.save(ResearchInterests(areas=["deep learning"], topics=[], arxiv_categories=[]))
+
+    first = temp_manager.load()
+    monkeypatch.setattr(manager, "_DECODER", None)
+    assert temp_manager.load() == first
+    monkeypatch.undo()
+
+    # Another writer replaces the file
+    other = InterestManager(data_dir=temp_manager.data_dir)
+    other.save(ResearchInterests(areas=["signal processing", "communication"], topics=[], arxiv_categories=[]))
+
+    reloaded = temp_manager.load()
+    assert reloaded is not first
+    assert reloaded.areas == ["signal processing", "communication"]
+
+
+def test_load_sees_same_size_save_by_other_writer(temp_manager):
+    """Test a save by another manager is loaded even when the file size is unchanged."""
+    temp_manager.save(ResearchInterests(areas=["aaaa"], topics=[], arxiv_categories=[]))
+    assert temp_manager.load().areas == ["aaaa"]
+
+    InterestManager(data_dir=temp_manager.data_dir).save(
+        ResearchInterests(areas=["bbbb"], topics=[], arxiv_categories=[])
+    )
+    assert temp_manager.load().areas == ["bbbb"]
+
+
+def test_load_returns_copy(temp_manager):
+    """Test changing loaded interests, or aborting a batch, leaves the cache alone."""
+    temp_manager.save(ResearchInterests(areas=[], topics=["saved"], arxiv_categories=[]))
+
+    temp_manager.load().topics.append("unsaved")
+    with pytest.raises(RuntimeError), temp_manager.batch():
+        temp_manager.add_topic("half-applied")
+        raise RuntimeError
+
+    assert temp_manager.load().topics == ["saved"]
+
+
+def test_load_corrupt_file_raises(temp_manager):
+    """Test a corrupt interests file is reported instead of ignored."""
+    temp_manager.interests_file.write_text('{"areas": ["deep lear')
+
+    with pytest.raises(ValueError, match="Could not read interests file"):
+        temp_manager.load()
+
+
+def test_save_leaves_no_temp_file(temp_manager):
+    """Test save replaces the interests file atomically."""
+    temp_manager.save(ResearchInterests(areas=["deep learning"], topics=[], arxiv_categories=[]))
+
+    assert [p.name for p in temp_manager.data_dir.iterdir()] == ["interests.json"]
+
+
+def test_load_wrong_types_raises(temp_manager):
+    """Test interests with wrongly typed fields are rejected."""
+    temp_manager.interests_file.write_text('{"areas": "deep learning", "topics": []}')
+
+    with pytest.raises(ValueError, match="Expected `array`"):
+        temp_manager.load()
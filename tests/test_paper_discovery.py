@@ -1,5 +1,7 @@
 """Tests for paper_discovery module."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -21,6 +23,13 @@ def sample_interests() -> ResearchInterests:
     return ResearchInterests(areas=["deep learning"], topics=["attention mechanisms"], arxiv_categories=["cs.LG"])
 
 
+def _mock_author(name: str) -> Mock:
+    """Create mock arXiv author (``Mock(name=...)`` names the mock itself)."""
+    author = Mock()
+    author.name = name
+    return author
+
+
 def test_build_query_with_all_fields(discoverer: PaperDiscoverer, sample_interests: ResearchInterests) -> None:
     """Test query building with all interest fields."""
     query = discoverer._build_query(sample_interests)
@@ -57,6 +66,14 @@ def test_build_query_areas_fallback(discoverer: PaperDiscoverer) -> None:
     assert "signal processing" in query
 
 
+def test_build_query_with_date_range(discoverer: PaperDiscoverer, sample_interests: ResearchInterests) -> None:
+    """Test date range is added as a server-side submittedDate clause."""
+    date_range = (datetime(2025, 10, 24, 9, 30), datetime(2025, 10, 31, 9, 30))
+
+    query = discoverer._build_query(sample_interests, date_range)
+    assert query.endswith(" AND submittedDate:[202510240930 TO 202510310930]")
+
+
 def test_build_query_empty(discoverer: PaperDiscoverer) -> None:
     """Test query with no interests returns all."""
     interests = ResearchInterests(areas=[], topics=[], arxiv_categories=[])
@@ -74,7 +91,7 @@ def test_discover_papers(
     mock_result = Mock()
     mock_result.entry_id = "http://arxiv.org/abs/2301.12345"
     mock_result.title = "Test Paper"
-    mock_result.authors = [Mock(name="Author One")]
+    mock_result.authors = [_mock_author("Author One")]
     mock_result.summary = "Test abstract"
     mock_result.published = datetime.now()
     mock_result.categories = ["cs.LG"]
@@ -93,6 +110,115 @@ def test_discover_papers(
     assert papers[0].authors == ["Author One"]
 
 
+def test_discover_chunks_many_topics(discoverer: PaperDiscoverer) -> None:
+    """Test large topic lists are split into several queries and merged."""
+    interests = ResearchInterests(areas=[], topics=[f"topic {i}" for i in range(10)], arxiv_categories=[])
+
+    mock_result = Mock()
+    mock_result.entry_id = "http://arxiv.org/abs/2301.12345"
+    mock_result.title = "Test Paper"
+    mock_result.authors = [_mock_author("Author One")]
+    mock_result.summary = "Test abstract"
+    mock_result.published = datetime.now()
+    mock_result.categories = ["cs.LG"]
+
+    mock_client = Mock()
+    mock_client.results.return_value = [mock_result]
+    discoverer.client = mock_client
+
+    papers = discoverer.discover(interests, days=7, max_results=20)
+
+    assert mock_client.results.call_count == 2
+    assert len(papers) == 1
+
+
+def _oai_page(records: str, token: str = "") -> Mock:
+    """Create mock OAI-PMH ListRecords response."""
+    response = Mock()
+    response.status_code = 200
+    response.content = f"""<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <ListRecords>{records}<resumptionToken>{token}</resumptionToken></ListRecords>
+</OAI-PMH>""".encode()
+    return response
+
+
+def _oai_record(arxiv_id: str, title: str, categories: str, created: str) -> str:
+    """Create OAI-PMH arXiv metadata record."""
+    return f"""
+    <record>
+      <header><identifier>oai:arXiv.org:{arxiv_id}</identifier></header>
+      <metadata>
+        <arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+          <id>{arxiv_id}</id>
+          <created>{created}</created>
+          <authors><author><keyname>One</keyname><forenames>Author</forenames></author></authors>
+          <title>{title}</title>
+          <categories>{categories}</categories>
+          <abstract>  Test
+            abstract </abstract>
+        </arXiv>
+      </metadata>
+    </record>"""
+
+
+def test_discover_large_uses_oai(discoverer: PaperDiscoverer, sample_interests: ResearchInterests) -> None:
+    """Test large category-based discovery harvests OAI-PMH pages and filters locally."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    first = _oai_page(
+        _oai_record("2301.00001", "Attention Mechanisms for Radar", "eess.SP cs.LG", today)
+        + _oai_record("2301.00002", "Attention in Databases", "cs.DB", today),
+        token="page-2",
+    )
+    second = _oai_page(
+        _oai_record("2301.00003", "Graph Networks", "cs.LG", today)
+        + _oai_record("1901.00004", "Old Attention Mechanisms Paper", "cs.LG", "2019-01-01")
+    )
+
+    mock_http = Mock()
+    mock_http.get.side_effect = [first, second]
+    discoverer.http = mock_http
+    discoverer.client = Mock()
+
+    papers = discoverer.discover(sample_interests, days=7, max_results=500)
+
+    assert [p.id for p in papers] == ["arxiv:2301.00001"]
+    assert papers[0].authors == ["Author One"]
+    assert papers[0].abstract == "Test abstract"
+    assert papers[0].arxiv_categories == ["eess.SP", "cs.LG"]
+    assert mock_http.get.call_args_list[0].kwargs["params"]["set"] == "cs"
+    assert mock_http.get.call_args_list[1].kwargs["params"] == {"verb": "ListRecords", "resumptionToken": "page-2"}
+    discoverer.client.results.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [("5", 5), ("Wed, 21 Oct 2026 07:28:00 GMT", 10), ("86400", 60), (None, 10)],
+    ids=["seconds", "http-date", "capped", "missing"],
+)
+def test_oai_request_retry_after(
+    discoverer: PaperDiscoverer, monkeypatch: pytest.MonkeyPatch, retry_after: str | None, expected: int
+) -> None:
+    """Test OAI-PMH 503s are retried after a parsed, capped Retry-After delay."""
+    busy = Mock(status_code=503, headers={"Retry-After": retry_after} if retry_after else {})
+    discoverer.http = Mock()
+    discoverer.http.get.side_effect = [busy, _oai_page("")]
+    sleeps: list[float] = []
+    monkeypatch.setattr("paper_discovery.discoverer.time.sleep", sleeps.append)
+
+    discoverer._oai_request({"verb": "ListRecords"})
+
+    assert sleeps == [expected]
+
+
+def test_oai_set(discoverer: PaperDiscoverer) -> None:
+    """Test mapping arXiv categories to OAI set specs."""
+    assert discoverer._oai_set("cs.LG") == "cs"
+    assert discoverer._oai_set("eess.SP") == "eess"
+    assert discoverer._oai_set("hep-th") == "physics:hep-th"
+    assert discoverer._oai_set("cond-mat.str-el") == "physics:cond-mat"
+
+
 @patch("paper_discovery.discoverer.arxiv.Client")
 def test_get_by_id(mock_client_class: Mock, discoverer: PaperDiscoverer) -> None:
     """Test getting paper by arXiv ID."""
@@ -100,7 +226,7 @@ def test_get_by_id(mock_client_class: Mock, discoverer: PaperDiscoverer) -> None
     mock_result = Mock()
     mock_result.entry_id = "http://arxiv.org/abs/2301.12345"
     mock_result.title = "Test Paper"
-    mock_result.authors = [Mock(name="Author One")]
+    mock_result.authors = [_mock_author("Author One")]
     mock_result.summary = "Test abstract"
     mock_result.published = datetime.now()
     mock_result.categories = ["cs.LG"]
@@ -130,3 +256,23 @@ def test_get_by_id_not_found(mock_client_class: Mock, discoverer: PaperDiscovere
     paper = discoverer.get_by_id("9999.99999")
 
     assert paper is None
+
+
+def test_get_by_id_serializes_arxiv_calls(discoverer: PaperDiscoverer) -> None:
+    """Test concurrent lookups never call the arXiv API at the same time."""
+    active = []
+    overlaps = []
+
+    def results(search):
+        overlaps.append(len(active))
+        active.append(search)
+        time.sleep(0.01)
+        active.remove(search)
+        return iter([])
+
+    discoverer.client = Mock()
+    discoverer.client.results.side_effect = results
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(discoverer.get_by_id, ["2301.00001", "2301.00002", "2301.00003", "2301.00004"]))
+
+    assert overlaps == [0, 0, 0, 0]
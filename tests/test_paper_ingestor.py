@@ -1,14 +1,22 @@
 """Tests for paper_ingestor module."""
 
 from pathlib import Path
+from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import patch
 
+import httpx
 import pytest
 from models import PaperCandidate
 from paper_ingestor import PaperIngestor
 
 
+@pytest.fixture(autouse=True)
+def no_pymupdf(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Exercise the pypdf path even when PyMuPDF is installed."""
+    monkeypatch.setattr("paper_ingestor.ingestor.fitz", None)
+
+
 @pytest.fixture
 def temp_ingestor(tmp_path: Path) -> PaperIngestor:
     """Create temporary paper ingestor."""
@@ -92,6 +100,71 @@ def test_extract_text(temp_ingestor: PaperIngestor, tmp_path: Path) -> None:
         assert text == "Test content"
 
 
+def test_extract_text_multiple_pages(temp_ingestor: PaperIngestor, tmp_path: Path) -> None:
+    """Test multi-page PDFs are extracted in page order."""
+    pdf_path = tmp_path / "long.pdf"
+    pdf_path.write_bytes(b"dummy pdf")
+
+    pages = []
+    for i in range(5):
+        mock_page = Mock()
+        mock_page.extract_text.return_value = f"Page {i}"
+        pages.append(mock_page)
+
+    mock_reader = Mock()
+    mock_reader.pages = pages
+
+    with patch("paper_ingestor.ingestor.PdfReader", return_value=mock_reader):
+        text = temp_ingestor._extract_text(pdf_path)
+
+    assert text == "\n\n".join(f"Page {i}" for i in range(5))
+
+
+def test_extract_text_stops_at_max_chars(temp_ingestor: PaperIngestor, tmp_path: Path) -> None:
+    """Test extraction stops once the character budget is reached."""
+    pdf_path = tmp_path / "long.pdf"
+    pdf_path.write_bytes(b"dummy pdf")
+
+    pages = []
+    for _ in range(10):
+        mock_page = Mock()
+        mock_page.extract_text.return_value = "x" * 100
+        pages.append(mock_page)
+
+    mock_reader = Mock()
+    mock_reader.pages = pages
+
+    with patch("paper_ingestor.ingestor.PdfReader", return_value=mock_reader):
+        text = temp_ingestor._extract_text(pdf_path, max_chars=250)
+
+    assert text.count("x") == 300
+    assert pages[3].extract_text.call_count == 0
+
+
+def test_extract_text_pymupdf(
+    temp_ingestor: PaperIngestor, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test PyMuPDF is used for extraction when installed."""
+    pdf_path = tmp_path / "test.pdf"
+    pdf_path.write_bytes(b"dummy pdf")
+
+    pages = []
+    for i in range(3):
+        mock_page = Mock()
+        mock_page.get_text.return_value = f"Page {i}"
+        pages.append(mock_page)
+
+    mock_fitz = MagicMock()
+    mock_fitz.open.return_value.__enter__.return_value = pages
+    monkeypatch.setattr("paper_ingestor.ingestor.fitz", mock_fitz)
+
+    with patch("paper_ingestor.ingestor.PdfReader") as mock_reader_class:
+        text = temp_ingestor._extract_text(pdf_path, max_chars=10)
+
+    assert text == "Page 0\n\nPage 1"
+    mock_reader_class.assert_not_called()
+
+
 def test_extract_text_empty(temp_ingestor: PaperIngestor, tmp_path: Path) -> None:
     """Test extracting from empty PDF raises error."""
     pdf_path = tmp_path / "test.pdf"
@@ -120,6 +193,21 @@ def test_ingest_from_local_not_found(temp_ingestor: PaperIngestor, tmp_path: Pat
         temp_ingestor.ingest_from_local(pdf_path)
 
 
+def test_download_pdf_direct(temp_ingestor: PaperIngestor) -> None:
+    """Test streaming PDF from a direct URL."""
+    mock_response = Mock()
+    mock_response.iter_bytes.return_value = [b"%PDF-", b"1.4"]
+
+    mock_http = MagicMock()
+    mock_http.stream.return_value.__enter__.return_value = mock_response
+
+    temp_ingestor.http = mock_http
+    pdf_path = temp_ingestor._download_pdf_direct("2301.12345", "https://arxiv.org/pdf/2301.12345")
+
+    mock_http.stream.assert_called_once_with("GET", "https://arxiv.org/pdf/2301.12345")
+    assert pdf_path.read_bytes() == b"%PDF-1.4"
+
+
 @patch("paper_ingestor.ingestor.arxiv.Client")
 @patch("paper_ingestor.ingestor.PdfReader")
 def test_ingest_from_arxiv(
@@ -128,7 +216,11 @@ def test_ingest_from_arxiv(
     temp_ingestor: PaperIngestor,
     sample_candidate: PaperCandidate,
 ) -> None:
-    """Test full ingestion from arXiv."""
+    """Test full ingestion from arXiv, falling back to the API when direct download fails."""
+    mock_http = Mock()
+    mock_http.stream.side_effect = httpx.ConnectError("offline")
+    temp_ingestor.http = mock_http
+
     # Mock arXiv download
     mock_result = Mock()
     mock_result.download_pdf = Mock()
@@ -150,3 +242,12 @@ def test_ingest_from_arxiv(
 
     assert "2301.12345.pdf" in pdf_path
     assert text == "Paper content"
+    mock_http.stream.assert_called_once_with("GET", "https://arxiv.org/pdf/2301.12345")
+    mock_result.download_pdf.assert_called_once()
+
+
+def test_ingestor_shares_arxiv_client(temp_ingestor: PaperIngestor) -> None:
+    """Test ingestor and discoverer use the same arXiv client."""
+    from paper_discovery import PaperDiscoverer
+
+    assert temp_ingestor.client is PaperDiscoverer().client
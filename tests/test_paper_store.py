@@ -1,39 +1,87 @@
 """Tests for paper_store module."""
 
+import os
+import re
+import sqlite3
+from dataclasses import replace
+
+import orjson
 import pytest
 from models import Paper
 from models import PaperInsights
+from paper_store import LogStorage
 from paper_store import PaperStore
+from paper_store import to_pretty_json
+
+
+# Expected error messages, compiled once for pytest.raises(match=...)
+_RE_EXISTS = re.compile("already exists")
+_RE_NOT_FOUND = re.compile("not found")
+
+_SAMPLE = Paper(
+    id="arxiv:2301.12345",
+    title="Test Paper",
+    authors=["Author One", "Author Two"],
+    url="https://arxiv.org/abs/2301.12345",
+    pdf_path=None,
+    added_date="2025-10-31",
+    interests=["deep learning"],
+    insights=PaperInsights(
+        problem="Test problem",
+        method="Test method",
+        key_results="Test results",
+        contributions=["Contribution 1"],
+        related_work=["Related 1"],
+        future_directions=["Future 1"],
+        classification="foundational",
+    ),
+    status="to-read",
+    notes="",
+)
+
+
+@pytest.fixture(scope="session")
+def _store_root():
+    """Create one in-memory paper store for the whole session."""
+    return PaperStore(storage="memory")
 
 
 @pytest.fixture
-def temp_store(tmp_path):
-    """Create temporary paper store."""
-    return PaperStore(data_dir=tmp_path / "papers")
+def temp_store(_store_root):
+    """Provide an empty paper store; changes are rolled back after the test."""
+    with _store_root.begin_nested() as savepoint:
+        yield _store_root
+        savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def populated_store():
+    """Create an in-memory store holding only _SAMPLE; tests must not modify it."""
+    store = PaperStore(storage="memory")
+    store.add(_SAMPLE)
+    return store
+
+
+@pytest.fixture
+def disk_store(tmp_path):
+    """Create temporary paper store backed by paper files."""
+    return PaperStore(data_dir=tmp_path / "papers", index_path=":memory:")
 
 
 @pytest.fixture
 def sample_paper():
-    """Create sample paper."""
-    return Paper(
-        id="arxiv:2301.12345",
-        title="Test Paper",
-        authors=["Author One", "Author Two"],
-        url="https://arxiv.org/abs/2301.12345",
-        pdf_path=None,
-        added_date="2025-10-31",
-        interests=["deep learning"],
-        insights=PaperInsights(
-            problem="Test problem",
-            method="Test method",
-            key_results="Test results",
-            contributions=["Contribution 1"],
-            related_work=["Related 1"],
-            future_directions=["Future 1"],
-            classification="foundational",
+    """Create sample paper (a copy of _SAMPLE that tests may modify)."""
+    insights = _SAMPLE.insights
+    return replace(
+        _SAMPLE,
+        authors=list(_SAMPLE.authors),
+        interests=list(_SAMPLE.interests),
+        insights=replace(
+            insights,
+            contributions=list(insights.contributions),
+            related_work=list(insights.related_work),
+            future_directions=list(insights.future_directions),
         ),
-        status="to-read",
-        notes="",
     )
 
 
@@ -47,12 +95,55 @@ def test_add_paper(temp_store, sample_paper):
     assert retrieved.title == sample_paper.title
 
 
-def test_add_duplicate_paper(temp_store, sample_paper):
-    """Test adding duplicate paper raises error."""
-    temp_store.add(sample_paper)
+@pytest.mark.parametrize(
+    ("operation", "match"),
+    [
+        (lambda store, paper: (store.add(paper), store.add(paper)), _RE_EXISTS),
+        (lambda store, paper: store.update(paper), _RE_NOT_FOUND),
+        (lambda store, paper: store.delete(paper.id), _RE_NOT_FOUND),
+    ],
+    ids=["add-duplicate", "update-nonexistent", "delete-nonexistent"],
+)
+def test_invalid_change_raises(temp_store, sample_paper, operation, match):
+    """Test adding a duplicate or changing a nonexistent paper raises error."""
+    with pytest.raises(ValueError, match=match):
+        operation(temp_store, sample_paper)
 
-    with pytest.raises(ValueError, match="already exists"):
-        temp_store.add(sample_paper)
+
+def test_paper_file_compact(disk_store, sample_paper):
+    """Test papers are stored as compact JSON and pretty-printed on demand."""
+    disk_store.add(sample_paper)
+
+    stored = (disk_store.data_dir / "arxiv_2301.12345.json").read_text()
+    assert "\n" not in stored
+
+    pretty = to_pretty_json(sample_paper)
+    assert '\n  "title": "Test Paper"' in pretty
+
+
+def test_saves_leave_no_temp_files(disk_store, sample_paper):
+    """Test writes go through a temporary file that is renamed into place."""
+    disk_store.add(sample_paper)
+    with pytest.raises(ValueError):
+        disk_store.add(sample_paper)
+    disk_store.update(sample_paper)
+
+    assert sorted(p.name for p in disk_store.data_dir.iterdir()) == ["arxiv_2301.12345.json"]
+
+
+def test_add_without_hard_links(disk_store, sample_paper, monkeypatch):
+    """Test adding papers on filesystems without hard links."""
+
+    def no_link(src, dst):
+        raise PermissionError("Operation not permitted")
+
+    monkeypatch.setattr("paper_store.storage.os.link", no_link)
+    disk_store.add(sample_paper)
+    with pytest.raises(ValueError, match=_RE_EXISTS):
+        disk_store.add(sample_paper)
+
+    assert disk_store.get(sample_paper.id) == sample_paper
+    assert sorted(p.name for p in disk_store.data_dir.iterdir()) == ["arxiv_2301.12345.json"]
 
 
 def test_get_nonexistent_paper(temp_store):
@@ -74,10 +165,18 @@ def test_update_paper(temp_store, sample_paper):
     assert retrieved.notes == "Finished reading"
 
 
-def test_update_nonexistent_paper(temp_store, sample_paper):
-    """Test updating nonexistent paper raises error."""
-    with pytest.raises(ValueError, match="not found"):
-        temp_store.update(sample_paper)
+def test_update_unchanged_paper_skips_write(disk_store, sample_paper):
+    """Test updating with identical data leaves the paper file alone."""
+    disk_store.add(sample_paper)
+    path = disk_store.data_dir / "arxiv_2301.12345.json"
+    before = path.stat()
+
+    disk_store.update(sample_paper)
+    assert path.stat().st_ino == before.st_ino
+
+    sample_paper.notes = "Changed"
+    disk_store.update(sample_paper)
+    assert path.stat().st_ino != before.st_ino
 
 
 def test_delete_paper(temp_store, sample_paper):
@@ -88,23 +187,16 @@ def test_delete_paper(temp_store, sample_paper):
     assert temp_store.get(sample_paper.id) is None
 
 
-def test_delete_nonexistent_paper(temp_store):
-    """Test deleting nonexistent paper raises error."""
-    with pytest.raises(ValueError, match="not found"):
-        temp_store.delete("nonexistent")
-
-
 def test_list_all_papers(temp_store, sample_paper):
     """Test listing all papers."""
     temp_store.add(sample_paper)
 
-    paper2 = Paper(
+    paper2 = replace(
+        _SAMPLE,
         id="arxiv:2301.67890",
         title="Second Paper",
         authors=["Author Three"],
         url="https://arxiv.org/abs/2301.67890",
-        pdf_path=None,
-        added_date="2025-10-31",
         interests=["signal processing"],
         insights=PaperInsights(
             problem="Test problem 2",
@@ -115,8 +207,6 @@ def test_list_all_papers(temp_store, sample_paper):
             future_directions=["Future 2"],
             classification="incremental",
         ),
-        status="to-read",
-        notes="",
     )
     temp_store.add(paper2)
 
@@ -126,27 +216,373 @@ def test_list_all_papers(temp_store, sample_paper):
     assert any(p.id == paper2.id for p in papers)
 
 
-def test_search_by_title(temp_store, sample_paper):
-    """Test searching by title."""
+def test_begin_nested_rollback(temp_store, sample_paper):
+    """Test rolling back a savepoint undoes adds, updates, and deletes."""
     temp_store.add(sample_paper)
+    original = temp_store.get(sample_paper.id)
 
-    results = temp_store.search("Test Paper")
+    with temp_store.begin_nested() as savepoint:
+        sample_paper.notes = "Changed"
+        temp_store.update(sample_paper)
+        temp_store.add(replace(sample_paper, id="arxiv:2301.99999"))
+        temp_store.delete(sample_paper.id)
+        savepoint.rollback()
+
+    assert temp_store.get(sample_paper.id) == original
+    assert temp_store.get("arxiv:2301.99999") is None
+    assert [p.id for p in temp_store.list_all()] == [sample_paper.id]
+
+
+def test_begin_nested_rollback_on_disk(disk_store, sample_paper):
+    """Test rolling back removes paper files added in the savepoint."""
+    with disk_store.begin_nested() as savepoint:
+        disk_store.add(sample_paper)
+        savepoint.rollback()
+
+    assert list(disk_store.data_dir.iterdir()) == []
+    assert disk_store.list_all() == []
+
+
+def test_begin_nested_release(temp_store, sample_paper):
+    """Test leaving a savepoint normally keeps its changes."""
+    with temp_store.begin_nested():
+        temp_store.add(sample_paper)
+
+    assert temp_store.get(sample_paper.id) == sample_paper
+    assert len(temp_store.search("Test Paper")) == 1
+
+
+def test_unknown_storage():
+    """Test an unknown storage name is rejected."""
+    with pytest.raises(ValueError, match="Unknown storage"):
+        PaperStore(storage="cloud")
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["Test Paper", "Test method", "test paper", "Author Two", "Related", "ut", "r o", "st r"],
+    ids=[
+        "title",
+        "insights",
+        "case-insensitive",
+        "authors",
+        "related-work",
+        "short-substring",
+        "substring",
+        "substring-across-words",
+    ],
+)
+def test_search(populated_store, query):
+    """Test searching by title, authors, and insights, ignoring case."""
+    results = populated_store.search(query)
     assert len(results) == 1
-    assert results[0].id == sample_paper.id
+    assert results[0].id == _SAMPLE.id
 
 
-def test_search_by_insights(temp_store, sample_paper):
-    """Test searching by insights content."""
+def test_search_reads_index_only(temp_store, sample_paper, monkeypatch):
+    """Test search results are decoded from the index, without loading stored papers."""
     temp_store.add(sample_paper)
 
-    results = temp_store.search("Test method")
-    assert len(results) == 1
-    assert results[0].id == sample_paper.id
+    def no_load(paper_id):
+        raise AssertionError("search loaded a stored paper")
+
+    monkeypatch.setattr(temp_store.storage, "load", no_load)
+    assert temp_store.search("Test method") == [sample_paper]
+
+
+def test_search_word_prefix(temp_store, sample_paper):
+    """Test search matches word prefixes across fields."""
+    temp_store.add(sample_paper)
+
+    assert len(temp_store.search("meth")) == 1
+    assert temp_store.search("unrelated") == []
+
+
+def test_log_storage_replayed_on_open(tmp_path, sample_paper):
+    """Test papers in the log survive reopening, with the latest record winning."""
+    data_dir = tmp_path / "papers"
+    with PaperStore(data_dir=data_dir, storage="log") as store:
+        store.add(sample_paper)
+        store.add(replace(sample_paper, id="arxiv:2301.99999"))
+        sample_paper.notes = "Updated"
+        store.update(sample_paper)
+        store.delete("arxiv:2301.99999")
+
+    with PaperStore(data_dir=data_dir, index_path=":memory:", storage="log") as reopened:
+        assert [p.notes for p in reopened.list_all()] == ["Updated"]
+        assert reopened.get("arxiv:2301.99999") is None
+    assert not list(data_dir.glob("*.json"))
+
+
+def test_log_storage_compact(tmp_path, sample_paper):
+    """Test compacting keeps only the latest record of each paper."""
+    with PaperStore(data_dir=tmp_path / "papers", storage="log") as store:
+        store.add(sample_paper)
+        for i in range(5):
+            sample_paper.notes = f"Note {i}"
+            store.update(sample_paper)
+
+        log_path = store.storage.log_path
+        store.storage.compact()
+        assert len(log_path.read_bytes().splitlines()) == 1
+
+        sample_paper.notes = "Note 5"
+        store.update(sample_paper)
+        assert len(log_path.read_bytes().splitlines()) == 2
+        assert store.get(sample_paper.id).notes == "Note 5"
+
+
+def test_log_storage_loads_lazily(tmp_path, sample_paper):
+    """Test papers are read from the log on demand, keeping a bounded cache."""
+    with PaperStore(index_path=":memory:", storage=LogStorage(tmp_path / "papers", cache_size=2)) as store:
+        for i in range(4):
+            store.add(replace(sample_paper, id=f"arxiv:2301.{i:05d}", notes=f"Note {i}"))
 
+    with LogStorage(tmp_path / "papers", cache_size=2) as reopened:
+        assert reopened.load("arxiv:2301.00003").notes == "Note 3"
+        assert reopened.load("arxiv:2301.00003") is reopened.load("arxiv:2301.00003")
+        loaded = reopened.load_keys(sorted(reopened.stamps()))
+        assert [p.notes for _, p in loaded] == [f"Note {i}" for i in range(4)]
+        assert len(reopened._cache) == 2
 
-def test_search_case_insensitive(temp_store, sample_paper):
-    """Test search is case-insensitive."""
+
+@pytest.mark.parametrize("storage", ["disk", "log"])
+def test_writes_survive_short_writes(tmp_path, sample_paper, monkeypatch, storage):
+    """Test papers are written in full when os.write() writes only part of its data."""
+    real_write = os.write
+    monkeypatch.setattr("paper_store.storage.os.write", lambda fd, data: real_write(fd, data[:7]))
+
+    with PaperStore(data_dir=tmp_path / "papers", storage=storage) as store:
+        store.add(sample_paper)
+    with PaperStore(data_dir=tmp_path / "papers", index_path=":memory:", storage=storage) as reopened:
+        assert reopened.list_all() == [sample_paper]
+
+
+def test_log_storage_closed_with_store(tmp_path, sample_paper):
+    """Test closing the store closes the log and the index database."""
+    with PaperStore(data_dir=tmp_path / "papers", storage="log") as store:
+        store.add(sample_paper)
+
+    assert store.storage._log_fd == -1
+    assert store.storage._reader.closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.list_all()
+
+
+def test_log_storage_drops_torn_record(tmp_path, sample_paper):
+    """Test a partly written last record is discarded on open."""
+    data_dir = tmp_path / "papers"
+    with PaperStore(data_dir=data_dir, storage="log") as store:
+        store.add(sample_paper)
+    with open(data_dir / "papers.log", "ab") as log:
+        log.write(b'arxiv:2301.99999\t{"id": "arxiv:23')
+
+    with PaperStore(data_dir=data_dir, index_path=":memory:", storage="log") as store:
+        store.add(replace(sample_paper, id="arxiv:2301.99999"))
+
+    with PaperStore(data_dir=data_dir, index_path=":memory:", storage="log") as reopened:
+        assert sorted(p.id for p in reopened.list_all()) == ["arxiv:2301.12345", "arxiv:2301.99999"]
+
+
+def test_search_short_query_substring(temp_store, sample_paper):
+    """Test queries too short to index fall back to substring matching."""
+    sample_paper.title = "ML on Graphs"
+    temp_store.add(sample_paper)
+
+    assert len(temp_store.search("ml")) == 1
+    assert len(temp_store.search("t m")) == 1
+    assert temp_store.search("xy") == []
+
+
+@pytest.mark.parametrize("query", ["ention", "o-of", "MIMO-OFDM", "ttention bas"])
+def test_search_mid_word_substring(temp_store, sample_paper, query):
+    """Test substrings starting mid-word match through the trigram index."""
+    sample_paper.title = "Attention Based MIMO-OFDM Detection"
     temp_store.add(sample_paper)
 
-    results = temp_store.search("test paper")
+    assert [p.id for p in temp_store.search(query)] == [sample_paper.id]
+
+
+def test_search_keeps_unindexable_words(temp_store, sample_paper):
+    """Test short or numeric query words still have to match."""
+    sample_paper.title = "Agents for 5G networks"
+    temp_store.add(sample_paper)
+
+    assert len(temp_store.search("5G networks")) == 1
+    assert temp_store.search("4G networks") == []
+    assert temp_store.search("RL agents") == []
+
+
+def test_search_short_query_non_ascii(temp_store, sample_paper):
+    """Test the substring fallback matches non-ASCII text case-insensitively."""
+    sample_paper.title = "Ωmega Nets"
+    temp_store.add(sample_paper)
+
+    assert len(temp_store.search("ω")) == 1
+
+
+def test_search_after_update_and_delete(temp_store, sample_paper):
+    """Test search index follows updates and deletes."""
+    temp_store.add(sample_paper)
+
+    sample_paper.title = "Renamed Survey"
+    temp_store.update(sample_paper)
+    assert len(temp_store.search("survey")) == 1
+
+    temp_store.delete(sample_paper.id)
+    assert temp_store.search("survey") == []
+
+
+def test_search_index_rebuilt_when_missing(tmp_path, sample_paper):
+    """Test search index is rebuilt from existing paper files."""
+    data_dir = tmp_path / "papers"
+    PaperStore(data_dir=data_dir).add(sample_paper)
+    (data_dir / "index.sqlite").unlink()
+
+    results = PaperStore(data_dir=data_dir).search("Test Paper")
     assert len(results) == 1
+
+
+def test_existing_paper_files_migrated(tmp_path, sample_paper):
+    """Test paper files written without an index database are loaded into it."""
+    data_dir = tmp_path / "papers"
+    PaperStore(data_dir=data_dir).add(sample_paper)
+    (data_dir / "index.sqlite").unlink()
+
+    papers = PaperStore(data_dir=data_dir).list_all()
+    assert len(papers) == 1
+    assert papers[0] == sample_paper
+
+
+def test_memory_index_built_from_paper_files(tmp_path, sample_paper):
+    """Test an in-memory index is filled from existing paper files."""
+    data_dir = tmp_path / "papers"
+    PaperStore(data_dir=data_dir, index_path=":memory:").add(sample_paper)
+
+    store = PaperStore(data_dir=data_dir, index_path=":memory:")
+    assert len(store.search("Test Paper")) == 1
+    assert not (data_dir / "index.sqlite").exists()
+
+
+def test_index_synced_with_changed_paper_files(tmp_path, sample_paper):
+    """Test paper files restored, edited, or removed behind the index are re-indexed on open."""
+    data_dir = tmp_path / "papers"
+    store = PaperStore(data_dir=data_dir)
+    store.add(sample_paper)
+    restored = replace(sample_paper, id="arxiv:2301.99999", title="Restored Paper")
+    store.storage.write(restored.id, orjson.dumps(restored))
+
+    sample_paper.status = "read"
+    path = data_dir / "arxiv_2301.12345.json"
+    path.write_bytes(orjson.dumps(sample_paper))
+
+    reopened = PaperStore(data_dir=data_dir)
+    assert sorted(s.status for s in reopened.list_summaries()) == ["read", "to-read"]
+    assert [p.id for p in reopened.search("restored")] == [restored.id]
+    with pytest.raises(ValueError, match=_RE_EXISTS):
+        reopened.add(restored)
+
+    path.unlink()
+    assert [p.id for p in PaperStore(data_dir=data_dir).list_all()] == [restored.id]
+
+
+def test_log_index_synced_after_compact(tmp_path, sample_paper):
+    """Test log records appended behind the index are re-indexed, and compacting changes nothing."""
+    data_dir = tmp_path / "papers"
+    with PaperStore(data_dir=data_dir, storage="log") as store:
+        store.add(sample_paper)
+        sample_paper.title = "Appended Behind The Index"
+        store.storage.write(sample_paper.id, orjson.dumps(sample_paper))
+        store.storage.compact()
+        stamps = store.storage.stamps()
+
+    with PaperStore(data_dir=data_dir, storage="log") as reopened:
+        assert [s.title for s in reopened.list_summaries()] == ["Appended Behind The Index"]
+        assert reopened.storage.stamps() == stamps
+
+
+def test_rebuild_loads_all_paper_files(tmp_path, sample_paper):
+    """Test every paper file is picked up when the index is rebuilt."""
+    data_dir = tmp_path / "papers"
+    store = PaperStore(data_dir=data_dir)
+    for i in range(20):
+        sample_paper.id = f"arxiv:2301.{i:05d}"
+        store.add(sample_paper)
+    (data_dir / "index.sqlite").unlink()
+
+    papers = PaperStore(data_dir=data_dir).list_all()
+    assert sorted(p.id for p in papers) == [f"arxiv:2301.{i:05d}" for i in range(20)]
+
+
+def test_list_summaries(temp_store, sample_paper):
+    """Test listing lightweight paper summaries."""
+    temp_store.add(sample_paper)
+
+    summaries = temp_store.list_summaries()
+    assert len(summaries) == 1
+    assert summaries[0].id == sample_paper.id
+    assert summaries[0].title == sample_paper.title
+    assert summaries[0].status == "to-read"
+    assert summaries[0].classification == "foundational"
+
+    sample_paper.status = "read"
+    sample_paper.insights = None
+    temp_store.update(sample_paper)
+
+    summaries = temp_store.list_summaries()
+    assert summaries[0].status == "read"
+    assert summaries[0].classification is None
+
+
+def test_loaded_papers_cached_until_file_changes(disk_store, sample_paper):
+    """Test paper files are re-read after every change, even one of the same size."""
+    sample_paper.notes = "aaaa"
+    disk_store.add(sample_paper)
+    assert disk_store.get(sample_paper.id).notes == "aaaa"
+
+    disk_store.update(replace(sample_paper, notes="bbbb"))
+    assert disk_store.get(sample_paper.id).notes == "bbbb"
+
+    disk_store.update(replace(sample_paper, notes="cccc", status="reading"))
+    assert disk_store.get(sample_paper.id).notes == "cccc"
+    assert disk_store.get(sample_paper.id).status == "reading"
+
+
+def test_loaded_papers_are_copies(disk_store, sample_paper):
+    """Test changing a loaded paper without updating doesn't change later loads."""
+    disk_store.add(sample_paper)
+
+    loaded = disk_store.get(sample_paper.id)
+    loaded.notes = "Unsaved"
+    loaded.insights.contributions.append("Unsaved")
+
+    assert disk_store.get(sample_paper.id) == sample_paper
+
+
+def test_memory_storage_get_reuses_parsed_paper(temp_store, sample_paper):
+    """Test in-memory gets return the same parsed paper until it is updated."""
+    temp_store.add(sample_paper)
+
+    first = temp_store.get(sample_paper.id)
+    assert temp_store.get(sample_paper.id) is first
+
+    sample_paper.notes = "Updated"
+    temp_store.update(sample_paper)
+    assert temp_store.get(sample_paper.id).notes == "Updated"
+
+
+def test_get_large_paper(disk_store, sample_paper):
+    """Test paper files big enough to be memory-mapped load correctly."""
+    sample_paper.notes = "Long reading notes. " * 500
+    disk_store.add(sample_paper)
+
+    assert disk_store.get(sample_paper.id) == sample_paper
+
+
+def test_search_ignores_diacritics(temp_store, sample_paper):
+    """Test non-ASCII words are indexed and match without accents."""
+    sample_paper.title = "Schrödinger Bridges for Denoising"
+    temp_store.add(sample_paper)
+
+    assert len(temp_store.search("schrodinger")) == 1
+    assert len(temp_store.search("Schrödinger")) == 1
@@ -0,0 +1,48 @@
+"""Tests for state module."""
+
+from state import SessionState
+
+
+def test_save_and_load(tmp_path):
+    """Test session state round-trips through its state file."""
+    state = SessionState.create_new("session-1")
+    state.current_operation = "discover"
+    state.data = {"seen": ["arxiv:2301.12345"], "progress": {"done": 3, "total": 10}}
+    state.save(base_path=tmp_path)
+
+    loaded = SessionState.load("session-1", base_path=tmp_path)
+    assert loaded == state
+
+
+def test_load_missing_session(tmp_path):
+    """Test loading a session that was never saved."""
+    assert SessionState.load("missing", base_path=tmp_path) is None
+
+
+def test_rapid_saves_throttled(tmp_path):
+    """Test saves right after a save are skipped unless forced."""
+    state = SessionState.create_new("session-1")
+    state.save(base_path=tmp_path)
+
+    state.data = {"done": 1}
+    state.save(base_path=tmp_path)
+    assert SessionState.load("session-1", base_path=tmp_path).data == {}
+
+    state.save(base_path=tmp_path, force=True)
+    assert SessionState.load("session-1", base_path=tmp_path).data == {"done": 1}
+
+
+def test_skipped_saves_flushed(tmp_path):
+    """Test flush() writes skipped saves, and other base paths aren't throttled."""
+    state = SessionState.create_new("session-1")
+    state.save(base_path=tmp_path / "a")
+    state.save(base_path=tmp_path / "b")
+    assert SessionState.load("session-1", base_path=tmp_path / "b") is not None
+
+    state.data = {"done": 1}
+    state.save(base_path=tmp_path / "a")
+    assert SessionState.load("session-1", base_path=tmp_path / "a").data == {}
+
+    state.flush()
+    assert SessionState.load("session-1", base_path=tmp_path / "a").data == {"done": 1}
+    assert SessionState.load("session-1", base_path=tmp_path / "b").data == {}